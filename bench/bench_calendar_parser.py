@@ -0,0 +1,58 @@
+# Calendar parsing: the original BeautifulSoup pass vs calendar_parser.
+#
+#   python bench/bench_calendar_parser.py [--repeat N]
+#
+# Runs both parsers over large synthetic Douglas and Lancaster calendar pages,
+# checks they find the same rows, and prints CPU time per page for each.
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+import calendar_parser
+from fixtures import calendar_page
+
+def legacy_rows(content):
+    """The calendar loop as scrapeCalendar() had it (case number line and row text only)."""
+    found = []
+    soup = BeautifulSoup(content, 'lxml')
+    rows = soup.find_all('tr')
+    for row in rows:
+        if "Restitution" in row.get_text() or "Real Fed" in row.get_text() or "LLT" in row.get_text() or "FED" in row.get_text():
+            listrow = row.get_text().splitlines()
+            if ("CR" not in listrow[6]):
+                found.append(listrow)
+    return found
+
+def fast_rows(content):
+    return [hit.lines for hit in calendar_parser.eviction_rows(content)]
+
+def cpu_per_call(fn, arg, repeat):
+    t0 = time.process_time()
+    for _ in range(repeat):
+        fn(arg)
+    return (time.process_time() - t0) / repeat
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Compare calendar parsers on synthetic pages.")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args(argv)
+    print(f"{'page':<12}{'rows':>6}{'hits':>6}{'legacy ms':>12}{'fast ms':>10}{'speedup':>9}")
+    for county in ("Douglas", "Lancaster"):
+        page = calendar_page(county, "05/06/2024")
+        expected = legacy_rows(page)
+        got = fast_rows(page)
+        if got != expected:
+            sys.exit(f"{county}: calendar_parser disagrees with the legacy parser")
+        legacy = cpu_per_call(legacy_rows, page, args.repeat)
+        fast = cpu_per_call(fast_rows, page, args.repeat)
+        print(f"{county:<12}{page.count(b'<tr'):>6}{len(got):>6}{legacy * 1000:>12.1f}{fast * 1000:>10.1f}"
+              f"{legacy / fast:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# Docket parsing: the original BeautifulSoup pass vs docket_parser.
+#
+#   python bench/bench_docket_parser.py [--pages N]
+#
+# Runs both over a batch of synthetic docket pages, checks they extract the same
+# first-defendant fields, and prints pages per second for each (plus the typed
+# party records docket_parser.parse() builds, as a bulk re-parse would).
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+import docket_parser
+from fixtures import docket_page
+
+def legacy_fields(content):
+    """The defendant extraction as scrapeCalendar() had it (logging left out)."""
+    fields = []
+    docket_blocks = BeautifulSoup(content, 'lxml').find_all('pre')
+    if len(docket_blocks) < 2:
+        return None
+    attorney_column_offset = docket_blocks[1].get_text().find("Attorney")
+    addresslines = docket_blocks[1].get_text().splitlines()
+    addresslines_no_attys = list()
+    if attorney_column_offset > 0:
+        for addressline in addresslines:
+            addresslines_no_attys.append(addressline[0:attorney_column_offset])
+    addresslines = [line.strip() for line in addresslines_no_attys]
+    start_yet = 0
+    defendant_count = 0
+    current_line = -1
+    for addressline in addresslines:
+        current_line += 1
+        if "Limited Representation Attorney" in addressline or " owes " in addressline or "Alias is " in addressline:
+            start_yet = 0
+        if "Defendant" in addressline:
+            start_yet = 1
+            defendant_count += 1
+        if start_yet == 1 and defendant_count == 1:
+            fields.append(addressline)
+        if start_yet == 1 and defendant_count > 1:
+            if "Defendant" in addressline:
+                nxt = addresslines[current_line + 1] if current_line + 1 < len(addresslines) else ""
+                if ("ccupants" not in nxt and "CCUPANTS" not in nxt and
+                    "ll other" not in nxt and "LL OTHER" not in nxt and
+                    "ll Other" not in nxt and "John Doe" not in nxt and
+                    "Jane Doe" not in nxt and "Real Name Unknown" not in nxt):
+                    if len(fields) > 1:
+                        fields[1] = fields[1] + ", " + nxt
+    return fields
+
+def fast_fields(content):
+    block = docket_parser.party_block(content)
+    if block is None:
+        return None
+    return docket_parser.first_defendant_fields(docket_parser.client_column(block)[1])
+
+def pages_per_sec(fn, pages):
+    t0 = time.process_time()
+    for page in pages:
+        fn(page)
+    return len(pages) / max(time.process_time() - t0, 1e-9)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Compare docket parsers on synthetic pages.")
+    ap.add_argument("--pages", type=int, default=2000)
+    args = ap.parse_args(argv)
+    pages = [docket_page(f"{i:07d}") for i in range(args.pages)]
+    for page in pages:
+        if fast_fields(page) != legacy_fields(page):
+            sys.exit("docket_parser disagrees with the legacy parser on:\n" + page.decode())
+    legacy = pages_per_sec(legacy_fields, pages)
+    fast = pages_per_sec(fast_fields, pages)
+    parties = pages_per_sec(docket_parser.parse, pages)
+    print(f"{len(pages)} docket pages")
+    print(f"  legacy BeautifulSoup      {legacy:>9.0f} pages/s")
+    print(f"  docket_parser fields      {fast:>9.0f} pages/s  ({fast / legacy:.1f}x)")
+    print(f"  docket_parser.parse()     {parties:>9.0f} pages/s  (typed party records)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+# End-to-end pipeline benchmark against the local replay server.
+#
+#   python bench/bench_pipeline.py [--scenarios metro,top10,all] [--engine threads]
+#                                  [--latency 40] [--jitter 20] [--capacity 4] [--parse-workers 2]
+#                                  [--save out.json] [--compare old.json]
+#
+# Starts bench/replay_server.py in-process, then runs each county option in its
+# own child process (so peak memory is per scenario) through run_scrape() with
+# the docket cache off. Reports cases/sec, wall time per phase, request latency
+# and peak RSS. --save writes the numbers with the current commit; --compare
+# prints the change against a saved file, so regressions show up between commits.
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import datetime
+import tempfile
+import subprocess
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+SCENARIOS = ("metro", "top10", "all")
+BENCH_DATE = "05/06/2024"
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None  # Windows
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def run_child(args):
+    """One scenario in this process; prints a JSON result line."""
+    import pipeline
+    from counties import resolve_counties
+    tmp = tempfile.mkdtemp(prefix="nejs-bench-")
+    try:
+        pipeline.CALENDAR_URL = args.base_url + "/courts/calendar/index.cgi"
+        pipeline.CASE_URL = args.base_url + "/justice/case.cgi"
+        pipeline.CHECKPOINT_DIR = os.path.join(tmp, "checkpoints")
+        pipeline.DOCKET_CACHE_DIR = os.path.join(tmp, "docket_cache")
+        pipeline.CASE_STORE_PATH = os.path.join(tmp, "case_store.sqlite3")
+        if args.docket_rate > 0:
+            pipeline.DOCKET_RATE = args.docket_rate
+        else:
+            pipeline.DOCKET_RATE = pipeline.DOCKET_BURST = 1e9  # measure the pipeline, not the pacing
+        pipeline.set_reporter(lambda msg: None, lambda kind, payload: None)
+        counties = resolve_counties(args.scenario)
+        t0 = time.perf_counter()
+        pipeline.run_scrape(counties, [BENCH_DATE], "bench", "bench", tmp,
+                            engine=args.engine, use_cache=False, parse_workers=args.parse_workers)
+        wall = time.perf_counter() - t0
+        report = pipeline.METRICS.report()
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    cases = report["counters"].get("cases", 0)
+    print(json.dumps({
+        "counties": len(counties),
+        "cases": cases,
+        "wall_secs": round(wall, 3),
+        "cases_per_sec": round(cases / wall, 1) if wall else 0.0,
+        "phases_secs": report["phases_secs"],
+        "requests": {kind: {"requests": r["requests"], "errors": r["errors"], "retries": r["retries"],
+                            "p50_ms": r["latency_ms"]["p50"], "p95_ms": r["latency_ms"]["p95"]}
+                     for kind, r in report["requests"].items()},
+        "parse_ms": {kind: p["total_ms"] for kind, p in report["parsing"].items()},
+        "concurrency": report["concurrency"],
+        "peak_rss_mb": peak_rss_mb(),
+    }))
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+def run_scenario(base_url, scenario, args):
+    cmd = [sys.executable, os.path.abspath(__file__), "--child", "--base-url", base_url,
+           "--scenario", scenario, "--engine", args.engine, "--docket-rate", str(args.docket_rate)]
+    if args.parse_workers is not None:
+        cmd += ["--parse-workers", str(args.parse_workers)]
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{scenario} failed:\n{proc.stderr}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+def _delta(new, old):
+    if not old or new is None:
+        return ""
+    return f" ({(new - old) / old * 100:+.0f}%)"
+
+def print_results(results, baseline=None):
+    base = (baseline or {}).get("scenarios", {})
+    print(f"{'scenario':<9}{'counties':>9}{'cases':>7}{'wall s':>9}{'cases/s':>9}"
+          f"{'calendars s':>13}{'dockets s':>11}{'peak MB':>9}")
+    for name, r in results.items():
+        phases = r["phases_secs"]
+        print(f"{name:<9}{r['counties']:>9}{r['cases']:>7}{r['wall_secs']:>9.2f}{r['cases_per_sec']:>9.1f}"
+              f"{phases.get('calendars', 0):>13.2f}{phases.get('dockets', 0):>11.2f}"
+              f"{r['peak_rss_mb'] if r['peak_rss_mb'] is not None else '-':>9}")
+        old = base.get(name)
+        if old:
+            print(f"{'':<9}vs {baseline.get('commit') or 'baseline'}: "
+                  f"cases/s{_delta(r['cases_per_sec'], old['cases_per_sec'])}, "
+                  f"wall{_delta(r['wall_secs'], old['wall_secs'])}, "
+                  f"peak MB{_delta(r['peak_rss_mb'], old.get('peak_rss_mb'))}")
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark the scrape pipeline against a local replay server.")
+    ap.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated county options")
+    ap.add_argument("--engine", default="threads")
+    ap.add_argument("--latency", type=float, default=40.0, help="server ms per response")
+    ap.add_argument("--jitter", type=float, default=20.0, help="+/- ms around --latency")
+    ap.add_argument("--scale", type=float, default=0.2, help="multiply synthetic calendar sizes")
+    ap.add_argument("--fixtures", help="folder of recorded calendar/ and docket/ pages")
+    ap.add_argument("--docket-rate", type=float, default=0, help="docket requests/sec (0 = unthrottled)")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="share of requests the server fails with 503")
+    ap.add_argument("--capacity", type=int, default=0, help="server requests in flight before it slows down (0 = never)")
+    ap.add_argument("--parse-workers", type=int, help="page-parsing processes (default: the pipeline's)")
+    ap.add_argument("--save", help="write results as JSON here")
+    ap.add_argument("--compare", help="JSON from an earlier --save to compare against")
+    # child mode (one scenario, started by the parent)
+    ap.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    ap.add_argument("--base-url", help=argparse.SUPPRESS)
+    ap.add_argument("--scenario", help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+
+    if args.child:
+        run_child(args)
+        return
+
+    from replay_server import ReplayServer
+    server = ReplayServer(0, args.latency, args.jitter, args.fixtures, args.scale,
+                          error_rate=args.error_rate, capacity=args.capacity).start()
+    results = {}
+    try:
+        for scenario in args.scenarios.split(","):
+            results[scenario] = run_scenario(server.base_url, scenario.strip(), args)
+    finally:
+        server.shutdown()
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"commit": git_commit(),
+                       "date": datetime.datetime.now().isoformat(timespec="seconds"),
+                       "params": {"engine": args.engine, "latency_ms": args.latency, "jitter_ms": args.jitter,
+                                  "scale": args.scale, "docket_rate": args.docket_rate,
+                                  "error_rate": args.error_rate, "capacity": args.capacity,
+                                  "parse_workers": args.parse_workers,
+                                  "fixtures": args.fixtures},
+                       "scenarios": results}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
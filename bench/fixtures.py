@@ -0,0 +1,91 @@
+# Synthetic court pages shaped like the live calendar and docket HTML.
+# Deterministic for a given seed so benchmark numbers are comparable across
+# commits. Rows follow the layout the scraper relies on: the calendar row text
+# splits into lines with the case number (CI240001234) on line 6, and the docket
+# party block is the second <pre> with attorneys in a column to the right.
+
+import random
+
+HEARING_TYPES = ["Restitution", "FED", "Real Fed", "LLT",                # evictions
+                 "Small Claims", "Arraignment", "Pretrial", "Sentencing",
+                 "Review", "Debtor Exam", "Garnishment", "Trial"]
+EVICTION_SHARE = 0.3    # fraction of calendar rows that are eviction hearings
+
+# Rough calendar sizes (rows per hearing day) for the county options
+CALENDAR_ROWS = {"Douglas": 2400, "Lancaster": 1200, "Sarpy": 400}
+DEFAULT_ROWS  = 60
+
+FIRST = ["JANE", "JOHN", "MARIA", "JOSE", "ASHLEY", "MICHAEL", "TANYA", "DAVID", "KEISHA", "ROBERT"]
+LAST  = ["DOE", "SMITH", "GARCIA", "NGUYEN", "JOHNSON", "BROWN", "MARTINEZ", "LEE", "WILSON", "TAYLOR"]
+LANDLORDS = ["ABC PROPERTIES LLC", "MIDWEST HOUSING LP", "PRAIRIE APARTMENTS LLC", "OAK VIEW MANAGEMENT INC"]
+
+def case_id(rng):
+    return f"{rng.randrange(1, 30000):07d}"
+
+def calendar_rows(county, rows=None, seed=0):
+    """[(hearing type, case number)] for one county's calendar day."""
+    rng = random.Random(f"{county}-{seed}")
+    n = rows if rows is not None else CALENDAR_ROWS.get(county, DEFAULT_ROWS)
+    out = []
+    for _ in range(n):
+        if rng.random() < EVICTION_SHARE:
+            out.append((rng.choice(HEARING_TYPES[:4]), "CI24" + case_id(rng)))
+        else:
+            prefix = rng.choice(["CR24", "CR24", "CI24", "SC24"])
+            out.append((rng.choice(HEARING_TYPES[4:]), prefix + case_id(rng)))
+    return out
+
+def calendar_page(county, targetDate, rows=None, seed=0):
+    """Calendar HTML for one county and date (bytes)."""
+    body = []
+    for i, (kind, case_number) in enumerate(calendar_rows(county, rows, seed)):
+        hour = 8 + i % 4
+        body.append(
+            f'<tr class="{"odd" if i % 2 else "even"}">\n'
+            f'<td>{hour:02d}:{(i * 5) % 60:02d} AM</td>\n'
+            f'<td>Courtroom {1 + i % 24}</td>\n'
+            f'<td>Judge {LAST[i % len(LAST)].title()}</td>\n'
+            f'<td>{kind}</td>\n'
+            f'<td>{LANDLORDS[i % len(LANDLORDS)]} v. {LAST[(i * 3) % len(LAST)]}, {FIRST[i % len(FIRST)]}</td>\n'
+            f'<td>{case_number}</td>\n'
+            f'</tr>\n')
+    return ("<!DOCTYPE html>\n<html><head><title>Court Calendar</title>"
+            '<meta charset="utf-8"><link rel="stylesheet" href="/courts/calendar/style.css"></head>\n'
+            "<body><div id=\"header\"><a href=\"/\">Nebraska Judicial Branch</a></div>\n"
+            f"<h2>County Court Calendar &mdash; {county} County &mdash; {targetDate}</h2>\n"
+            "<table class=\"calendar\">\n<tr><th>Time</th><th>Room</th><th>Judge</th>"
+            "<th>Hearing</th><th>Caption</th><th>Case</th></tr>\n"
+            + "".join(body)
+            + "</table>\n<div id=\"footer\">Calendar information is subject to change.</div></body></html>\n"
+            ).encode("utf-8")
+
+def _party(role, lines, attorney=(), width=40):
+    out = [role.ljust(width) + ("Attorney" if attorney else "")]
+    for i, line in enumerate(lines):
+        atty = attorney[i] if i < len(attorney) else ""
+        out.append(line.ljust(width) + atty)
+    return out
+
+def docket_page(case_id, seed=0, defendants=None, pad_entries=40):
+    """Docket HTML for one case (bytes): a header <pre>, the party <pre>, and a run of docket entries."""
+    rng = random.Random(f"{case_id}-{seed}")
+    n_def = defendants if defendants is not None else rng.choice([1, 1, 2, 2, 3])
+    street = f"{rng.randrange(100, 9999)} {rng.choice(['MAIN', 'DODGE', 'FARNAM', 'O', 'MAPLE'])} ST"
+    apt = rng.choice(["", "", f"APT {rng.randrange(1, 40)}"])
+    lines = []
+    lines += _party("Plaintiff", [rng.choice(LANDLORDS), "PO BOX 1", "OMAHA, NE 68102"],
+                    ["SMITH, JOHN A", "100 LAW ST", "OMAHA, NE 68102"])
+    lines.append("")
+    for d in range(n_def):
+        name = f"{rng.choice(LAST)}, {rng.choice(FIRST)}" if d < 2 else "ALL OTHER OCCUPANTS"
+        addr = [street] + ([apt] if apt else []) + ["OMAHA, NE 68105"]
+        lines += _party("Defendant", [name] + (addr if d < 2 else []))
+        lines.append("")
+    entries = "\n".join(f"{(i % 12) + 1:02d}/{(i % 28) + 1:02d}/2024 Docket entry {i}: "
+                        + rng.choice(["Summons issued", "Hearing set", "Return of service", "Judgment"])
+                        for i in range(pad_entries))
+    return ("<html><head><title>Case Search</title></head><body>\n"
+            f"<pre>County Court of Douglas County, Nebraska\nCase ID: CI 24 {case_id}\n"
+            f"{LANDLORDS[0]} v. DEFENDANT</pre>\n"
+            "<pre>\n" + "\n".join(lines) + "\n</pre>\n"
+            "<pre>" + entries + "</pre>\n</body></html>\n").encode("utf-8")
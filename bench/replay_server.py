@@ -0,0 +1,167 @@
+# Local HTTP stand-in for the E-Services endpoints the scraper hits.
+#
+#   python bench/replay_server.py [--port 8765] [--latency 40] [--jitter 20] [--fixtures DIR]
+#                                 [--error-rate 0.05] [--down-for 10] [--capacity 4]
+#
+# Serves /courts/calendar/index.cgi and /justice/case.cgi with HTTP/1.1
+# keep-alive, after a configurable delay (latency +/- jitter, in ms). Pages come
+# from recorded fixtures when a folder is given (calendar/<County>.html,
+# docket/<case_id>.html) and otherwise from the synthetic pages in fixtures.py.
+# --error-rate answers that share of requests with a 503, and --down-for answers
+# everything with 503 for the first N seconds, to exercise retries and backoff.
+# --capacity N makes the server slow down like a loaded one: past N requests in
+# flight, each response takes proportionally longer.
+
+import os
+import sys
+import time
+import random
+import argparse
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fixtures import calendar_page, docket_page, CALENDAR_ROWS, DEFAULT_ROWS
+
+class ReplayServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port=0, latency_ms=40.0, jitter_ms=20.0, fixtures_dir=None, scale=1.0, seed=0,
+                 error_rate=0.0, down_for=0.0, capacity=0):
+        super().__init__(("127.0.0.1", port), ReplayHandler)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.fixtures_dir = fixtures_dir
+        self.scale = scale
+        self.seed = seed
+        self.error_rate = error_rate
+        self.down_until = time.monotonic() + down_for
+        self.capacity = capacity
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.hits = {"calendar": 0, "docket": 0, "other": 0}
+        self.errors = 0
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def delay(self):
+        with self._lock:
+            ms = self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)
+            if self.capacity and self.in_flight > self.capacity:
+                ms *= self.in_flight / self.capacity
+        if ms > 0:
+            time.sleep(ms / 1000.0)
+
+    def enter(self):
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def leave(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def fail_now(self):
+        with self._lock:
+            failing = time.monotonic() < self.down_until or self._rng.random() < self.error_rate
+            if failing:
+                self.errors += 1
+            return failing
+
+    def count(self, kind, nbytes):
+        with self._lock:
+            self.hits[kind] += 1
+            self.bytes_sent += nbytes
+
+    def recorded(self, kind, name):
+        if not self.fixtures_dir:
+            return None
+        path = os.path.join(self.fixtures_dir, kind, name + ".html")
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def calendar(self, county, targetDate):
+        body = self.recorded("calendar", county)
+        if body is None:
+            rows = max(1, int(CALENDAR_ROWS.get(county, DEFAULT_ROWS) * self.scale))
+            body = calendar_page(county, targetDate, rows=rows, seed=f"{self.seed}-{targetDate}")
+        return body
+
+    def docket(self, case_id):
+        body = self.recorded("docket", case_id)
+        return body if body is not None else docket_page(case_id, seed=self.seed)
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+    def do_GET(self):
+        url = urllib.parse.urlparse(self.path)
+        qs = urllib.parse.parse_qs(url.query)
+        server = self.server
+        server.enter()
+        try:
+            self.respond(url, qs, server)
+        finally:
+            server.leave()
+
+    def respond(self, url, qs, server):
+        server.delay()
+        if server.fail_now():
+            self.send_error(503)
+            return
+        if url.path.endswith("/calendar/index.cgi"):
+            kind = "calendar"
+            body = server.calendar((qs.get("countyC") or [""])[0], (qs.get("searchField") or [""])[0])
+        elif url.path.endswith("/justice/case.cgi"):
+            kind = "docket"
+            body = server.docket((qs.get("case_id") or [""])[0])
+        else:
+            server.count("other", 0)
+            self.send_error(404)
+            return
+        server.count(kind, len(body))
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Serve calendar and docket fixtures locally.")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency", type=float, default=40.0, help="ms per response")
+    ap.add_argument("--jitter", type=float, default=20.0, help="+/- ms around --latency")
+    ap.add_argument("--scale", type=float, default=1.0, help="multiply synthetic calendar sizes")
+    ap.add_argument("--fixtures", help="folder of recorded calendar/ and docket/ pages")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with 503")
+    ap.add_argument("--down-for", type=float, default=0.0, help="answer everything with 503 for this many seconds")
+    ap.add_argument("--capacity", type=int, default=0, help="requests in flight before responses slow down (0 = never)")
+    args = ap.parse_args(argv)
+    server = ReplayServer(args.port, args.latency, args.jitter, args.fixtures, args.scale,
+                          error_rate=args.error_rate, down_for=args.down_for, capacity=args.capacity)
+    print(f"Serving on {server.base_url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
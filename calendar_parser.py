@@ -0,0 +1,69 @@
+# Fast parser for court calendar pages (courts/calendar/index.cgi).
+# The page is parsed once by lxml (no BeautifulSoup tree) and the <tr> rows are
+# walked in a single pass: each row's text is pulled once with a compiled XPath
+# and checked against one compiled pattern for the eviction hearing types,
+# instead of four get_text() calls per row.
+
+import re
+from lxml import etree
+
+EVICTION_MARKERS = ("Restitution", "Real Fed", "LLT", "FED")  # hearing types that mean an eviction
+CASE_NUMBER_LINE = 6                                           # row text line holding the case number, e.g. CI240001234
+
+_MARKER_RE = re.compile("|".join(re.escape(m) for m in EVICTION_MARKERS))
+_MARKER_BYTES_RE = re.compile(_MARKER_RE.pattern.encode("ascii"))
+_CASE_NUMBER_RE = re.compile(r"\s*[A-Z]{2}\s*(\d{2})\s*(\d+)\s*$")  # CI240001234 -> 24, 0001234
+_ROW_TEXT = etree.XPath("string()", smart_strings=False)  # plain str, no back-reference to the tree
+
+class CalendarHit:
+    """
+    One eviction row: its case number, the year and id parsed from it (None if
+    it isn't shaped like CI240001234), and the row's text lines (as
+    get_text().splitlines() gave them).
+    """
+    __slots__ = ("case_number", "case_year", "case_id", "lines")
+
+    def __init__(self, case_number, lines):
+        self.case_number = case_number
+        self.lines = lines
+        m = _CASE_NUMBER_RE.match(case_number)
+        self.case_year, self.case_id = m.groups() if m else (None, None)
+
+def page_encoding(content):
+    """The encoding decode_page() reads page bytes with: UTF-8, or cp1252 for older pages."""
+    try:
+        content.decode("utf-8")
+    except UnicodeDecodeError:
+        return "cp1252"
+    return "utf-8"
+
+def decode_page(content):
+    """Page bytes as text: UTF-8, or cp1252 for older pages."""
+    if isinstance(content, str):
+        return content
+    return content.decode(page_encoding(content), errors="replace")
+
+def eviction_rows(content):
+    """
+    Every eviction hearing row on a calendar page, in page order. Rows whose case
+    number is criminal (CR) and rows too short to hold a case number are skipped.
+    """
+    page = content or b""
+    if isinstance(page, str):
+        page = page.encode("utf-8")
+    if _MARKER_BYTES_RE.search(page) is None:
+        return []  # nothing to find: skip building the tree
+    # Parse the bytes: lxml refuses str input that carries an XML encoding declaration
+    root = etree.fromstring(page, etree.HTMLParser(encoding=page_encoding(page)))
+    if root is None:
+        return []
+    hits = []
+    for tr in root.iter("tr"):
+        text = _ROW_TEXT(tr)
+        if _MARKER_RE.search(text) is None:
+            continue
+        lines = text.splitlines()
+        if len(lines) <= CASE_NUMBER_LINE or "CR" in lines[CASE_NUMBER_LINE]:
+            continue
+        hits.append(CalendarHit(lines[CASE_NUMBER_LINE], lines))
+    return hits
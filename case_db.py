@@ -0,0 +1,140 @@
+# Optional SQLite database of everything the scraper has found, across runs.
+# Hearings from the calendars, cases with their first defendant's address, and
+# every party on each docket are upserted in batched transactions (WAL mode),
+# with indexes on case number, county, hearing date and normalized party name,
+# so questions like "has this defendant shown up before?" are one query.
+#
+#   SELECT c.case_number, c.county, h.hearing_date FROM parties p
+#     JOIN cases c ON c.key = p.case_key JOIN hearings h ON h.case_key = c.key
+#    WHERE p.name_norm = ? AND p.role = 'Defendant';
+
+import re
+import sqlite3
+import datetime
+import threading
+
+BATCH_ROWS = 500  # queued writes per transaction
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS cases ("
+    " key TEXT PRIMARY KEY, case_number TEXT, county TEXT, url TEXT,"
+    " defendant TEXT, address TEXT, city_state_zip TEXT, fingerprint TEXT,"
+    " first_seen TEXT NOT NULL, last_scraped TEXT)",
+    "CREATE TABLE IF NOT EXISTS hearings ("
+    " case_key TEXT NOT NULL, hearing_date TEXT NOT NULL, county TEXT,"
+    " PRIMARY KEY (case_key, hearing_date))",
+    "CREATE TABLE IF NOT EXISTS parties ("
+    " case_key TEXT NOT NULL, position INTEGER NOT NULL, role TEXT, name TEXT, name_norm TEXT,"
+    " address TEXT, attorney TEXT, PRIMARY KEY (case_key, position))",
+    "CREATE INDEX IF NOT EXISTS cases_case_number ON cases(case_number)",
+    "CREATE INDEX IF NOT EXISTS cases_county ON cases(county)",
+    "CREATE INDEX IF NOT EXISTS hearings_date ON hearings(hearing_date)",
+    "CREATE INDEX IF NOT EXISTS parties_name ON parties(name_norm)",
+)
+
+_UPSERT_CASE = (
+    "INSERT INTO cases (key, case_number, county, url, defendant, address, city_state_zip,"
+    " fingerprint, first_seen, last_scraped) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+    " ON CONFLICT(key) DO UPDATE SET case_number = excluded.case_number, county = excluded.county,"
+    "  url = excluded.url, defendant = COALESCE(excluded.defendant, cases.defendant),"
+    "  address = COALESCE(excluded.address, cases.address),"
+    "  city_state_zip = COALESCE(excluded.city_state_zip, cases.city_state_zip),"
+    "  fingerprint = COALESCE(excluded.fingerprint, cases.fingerprint),"
+    "  last_scraped = COALESCE(excluded.last_scraped, cases.last_scraped)")
+_UPSERT_HEARING = (
+    "INSERT INTO hearings (case_key, hearing_date, county) VALUES (?, ?, ?)"
+    " ON CONFLICT(case_key, hearing_date) DO UPDATE SET county = excluded.county")
+_INSERT_CASE_IF_NEW = (
+    "INSERT INTO cases (key, case_number, county, url, first_seen) VALUES (?, ?, ?, ?, ?)"
+    " ON CONFLICT(key) DO NOTHING")
+_DELETE_PARTIES = "DELETE FROM parties WHERE case_key = ?"
+_INSERT_PARTY = ("INSERT INTO parties (case_key, position, role, name, name_norm, address, attorney)"
+                 " VALUES (?, ?, ?, ?, ?, ?, ?)")
+
+_NON_WORD_RE = re.compile(r"[^\w\s]")
+
+def normalize_name(name):
+    """'Doe, John  A.' and 'JOHN A DOE' both -> 'A DOE JOHN': upper case, no punctuation, words sorted."""
+    return " ".join(sorted(_NON_WORD_RE.sub(" ", name or "").upper().split()))
+
+def iso_date(mmddyyyy):
+    try:
+        return datetime.datetime.strptime(mmddyyyy, "%m/%d/%Y").date().isoformat()
+    except (TypeError, ValueError):
+        return mmddyyyy
+
+class CaseDatabase:
+    """Thread-safe writer: add_* calls queue statements, committed batch_rows at a time in one transaction."""
+
+    def __init__(self, path, batch_rows=BATCH_ROWS):
+        self.path = path
+        self.batch_rows = batch_rows
+        self.written = {"cases": 0, "hearings": 0, "parties": 0}
+        self._queue = []
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")  # WAL keeps this crash-safe
+        for statement in _SCHEMA:
+            self._db.execute(statement)
+        self._db.commit()
+
+    @staticmethod
+    def _now():
+        return datetime.datetime.now().isoformat(timespec="seconds")
+
+    def _put(self, table, ops, rows=1):
+        with self._lock:
+            self._queue.extend(ops)
+            self.written[table] += rows
+            if len(self._queue) >= self.batch_rows:
+                self._flush()
+
+    def _flush(self):
+        if not self._queue:
+            return
+        ops, self._queue = self._queue, []
+        with self._db:
+            for sql, params in ops:
+                self._db.execute(sql, params)
+
+    def add_hearings(self, entries):
+        """CalendarEntry objects from the calendars: one hearing row each, plus the case if it's new."""
+        now = self._now()
+        for entry in entries:
+            case = entry.case
+            self._put("hearings", [
+                (_INSERT_CASE_IF_NEW, (case.key, case.case_number, case.county, case.url, now)),
+                (_UPSERT_HEARING, (case.key, iso_date(entry.hearing_date), entry.county)),
+            ])
+
+    def add_case(self, case, row=None, fingerprint=None):
+        """
+        A case whose docket was read: row is its DocketRow (None if the docket
+        couldn't be parsed or was unchanged, keeping the stored address), fingerprint
+        its party-block hash (None if the page wasn't read).
+        """
+        now = self._now()
+        self._put("cases", [(_UPSERT_CASE, (
+            case.key, case.case_number, case.county, case.url,
+            row.name if row else None, row.address if row else None, row.city_state_zip if row else None,
+            fingerprint, now, now if fingerprint else None))])
+
+    def add_parties(self, case_key, parties):
+        """Replace a case's parties with docket_parser.Party objects, in page order."""
+        ops = [(_DELETE_PARTIES, (case_key,))]
+        for position, party in enumerate(parties):
+            ops.append((_INSERT_PARTY, (case_key, position, party.role, party.name, normalize_name(party.name),
+                                        "\n".join(party.address), "\n".join(party.attorney))))
+        self._put("parties", ops, len(parties))
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        with self._lock:
+            try:
+                self._flush()
+            finally:
+                self._db.close()
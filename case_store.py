@@ -0,0 +1,94 @@
+# Local store of the cases the scraper has seen and their docket fingerprints.
+# A fingerprint is a hash of the docket's party block (names, addresses,
+# attorneys, whitespace squeezed), so a run can tell which cases are new on the
+# calendar and which dockets changed since they were last read. The store is a
+# small SQLite table; a run's observations are saved in one transaction when it
+# finishes, so a stopped run compares against the same baseline when resumed.
+
+import time
+import hashlib
+import sqlite3
+import threading
+
+NEW, CHANGED = "new", "changed"
+
+def fingerprint(block):
+    """Hash of a party block that ignores spacing and blank lines."""
+    text = "\n".join(" ".join(line.split()) for line in block.splitlines() if line.strip())
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+class CaseStore:
+    """
+    Thread-safe fingerprints by case key (CaseRef.key). With incremental=True,
+    unchanged() lets callers skip parsing dockets whose party block is the same
+    as last time; otherwise the store only records what each run saw.
+    """
+
+    def __init__(self, path, incremental=False):
+        self.path = path
+        self.incremental = incremental
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS cases ("
+            " key TEXT PRIMARY KEY, fingerprint TEXT NOT NULL,"
+            " first_seen REAL NOT NULL, last_checked REAL NOT NULL, last_changed REAL NOT NULL)")
+        self._db.commit()
+        self._previous = dict(self._db.execute("SELECT key, fingerprint FROM cases"))
+        self._seen = {}  # key -> fingerprint read this run
+
+    def known(self, key):
+        return key in self._previous
+
+    def baseline(self, key):
+        """The fingerprint unchanged() compares key against (None outside incremental runs)."""
+        return self._previous.get(key) if self.incremental else None
+
+    def unchanged(self, key, fp):
+        """True if this is an incremental run and key's party block hashes as it did last time."""
+        return self.incremental and fp is not None and self._previous.get(key) == fp
+
+    def observe(self, key, fp):
+        if fp is not None:
+            with self._lock:
+                self._seen[key] = fp
+
+    def change(self, key):
+        """NEW, CHANGED or None (unchanged, or known but not read this run)."""
+        previous = self._previous.get(key)
+        if previous is None:
+            return NEW
+        fp = self._seen.get(key)
+        if fp is None or fp == previous:
+            return None
+        return CHANGED
+
+    def counts(self):
+        """{"new": n, "changed": n, "unchanged": n} over the cases read this run."""
+        counts = {NEW: 0, CHANGED: 0, "unchanged": 0}
+        with self._lock:
+            keys = list(self._seen)
+        for key in keys:
+            counts[self.change(key) or "unchanged"] += 1
+        return counts
+
+    def save(self):
+        """Write this run's fingerprints in one transaction."""
+        now = time.time()
+        with self._lock:
+            rows = [(key, fp, now, now, now) for key, fp in self._seen.items()]
+            with self._db:
+                self._db.executemany(
+                    "INSERT INTO cases (key, fingerprint, first_seen, last_checked, last_changed)"
+                    " VALUES (?, ?, ?, ?, ?)"
+                    " ON CONFLICT(key) DO UPDATE SET"
+                    "  last_checked = excluded.last_checked,"
+                    "  last_changed = CASE WHEN cases.fingerprint = excluded.fingerprint"
+                    "                 THEN cases.last_changed ELSE excluded.last_changed END,"
+                    "  fingerprint = excluded.fingerprint", rows)
+            self._previous.update(self._seen)
+            self._seen = {}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,83 @@
+# Checkpoint journal so a stopped or crashed run can be resumed.
+# One append-only JSON-lines file per target date (or date range) records each
+# (date, county) calendar that was parsed, with its eviction rows, and each case
+# whose docket was parsed, with its fields and party-block fingerprint. A resumed
+# run replays those instead of re-fetching.
+
+import os
+import json
+import threading
+
+def journal_path(root, targetDates):
+    """<root>/<mm-dd-yyyy>.jsonl, or <root>/<first>_to_<last>.jsonl for a batch of mm/dd/yyyy dates."""
+    name = targetDates[0].replace("/", "-")
+    if len(targetDates) > 1:
+        name += "_to_" + targetDates[-1].replace("/", "-")
+    return os.path.join(root, name + ".jsonl")
+
+class CheckpointJournal:
+    """Thread-safe journal of completed calendars and cases for one run's dates."""
+
+    def __init__(self, path, resume=False):
+        self.path = path
+        self.calendars = {}  # (date, county) -> calendar rows
+        self.cases = {}      # case url -> docket fields
+        self.fingerprints = {}  # case url -> party-block fingerprint (None for older journals)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if resume:
+            self._load()
+        elif os.path.exists(path):
+            os.remove(path)
+        self._lock = threading.Lock()
+        self._f = open(path, "a", encoding="utf-8")
+        if self._f.tell() > 0 and not self._ends_with_newline():
+            self._f.write("\n")  # don't glue new records onto a torn line
+
+    def _ends_with_newline(self):
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue  # torn last line from a crash
+                if rec.get("type") == "calendar":
+                    self.calendars[(rec["date"], rec["county"])] = rec["rows"]
+                elif rec.get("type") == "case":
+                    self.cases[rec["url"]] = rec["fields"]
+                    self.fingerprints[rec["url"]] = rec.get("fp")
+
+    def _append(self, rec):
+        with self._lock:
+            if self._f.closed:
+                return
+            self._f.write(json.dumps(rec) + "\n")
+            self._f.flush()
+            os.fsync(self._f.fileno())
+
+    def calendar_done(self, targetDate, county, rows):
+        self.calendars[(targetDate, county)] = rows
+        self._append({"type": "calendar", "date": targetDate, "county": county, "rows": rows})
+
+    def case_done(self, url, fields, fingerprint=None):
+        self.cases[url] = fields
+        self.fingerprints[url] = fingerprint
+        self._append({"type": "case", "url": url, "fields": fields, "fp": fingerprint})
+
+    def close(self):
+        with self._lock:
+            self._f.close()
+
+    def discard(self):
+        """Run finished cleanly: nothing left to resume."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
@@ -0,0 +1,193 @@
+# Headless entry point for the Nebraska Courts E-Services Scraper.
+# Runs the same pipeline as the GUI without tkinter, tkcalendar or winsound,
+# so it can be scheduled (cron, Task Scheduler) on a machine with no display.
+#
+#   python cli.py --date 05/06/2024 --counties metro --out /data/evictions
+#   python cli.py --date 05/06/2024 --through 05/10/2024 --counties Douglas,Sarpy --per-date
+#   python cli.py --date 05/06/2024 --counties all --incremental
+#   python cli.py --date 05/06/2024 --counties metro --db /data/evictions/cases.sqlite3
+#   python cli.py --date 05/01/2024 --through 05/31/2024 --counties all --parquet
+#   python cli.py --date 05/06/2024 --counties all --progress-file /var/run/nejs/progress.json
+#   python cli.py --date 05/06/2024 --counties all --archive
+#   python cli.py --date 05/01/2024 --through 05/31/2024 --counties all --reparse
+#
+# Credentials come from --credentials-file (an ini file with an [auth] section
+# holding username/password) or the NEJUSTICE_USERNAME / NEJUSTICE_PASSWORD
+# environment variables. Exit status: 0 done, 1 failed, 2 stopped (partial CSV), 3 bad arguments.
+# A court server that stays down also stops the run (status 2, with an [ERROR] line).
+# Progress (done/total, rate, ETA) is printed every PROGRESS_PRINT_SECS; with
+# --progress-file the latest snapshot is also kept in a JSON file whose
+# "updated" time stops moving if the run stalls. --reparse rebuilds the CSVs
+# from pages kept by earlier --archive runs, without credentials or network.
+
+import sys
+import os
+import json
+import time
+import signal
+import argparse
+import configparser
+import datetime
+import threading
+
+import pipeline
+from counties import resolve_counties
+from progress import format_progress
+
+EXIT_OK, EXIT_FAILED, EXIT_STOPPED, EXIT_USAGE = 0, 1, 2, 3
+PROGRESS_PRINT_SECS = 10  # at most one progress line this often (stage starts and ends always print)
+
+def load_credentials(path=None):
+    """(username, password) from an ini file's [auth] section, falling back to the environment."""
+    username = os.getenv("NEJUSTICE_USERNAME", "")
+    password = os.getenv("NEJUSTICE_PASSWORD", "")
+    if path:
+        cfg = configparser.ConfigParser(interpolation=None)
+        if not cfg.read(path, encoding="utf-8"):
+            raise ValueError(f"Can't read credentials file {path}")
+        if "auth" in cfg:
+            username = cfg["auth"].get("username", username)
+            password = cfg["auth"].get("password", password)
+    return username, password
+
+def write_progress_file(path, status):
+    """Replace path with status as JSON, atomically, so a reader never sees half a file."""
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(status, f, indent=2)
+    os.replace(tmp, path)
+
+def build_parser():
+    ap = argparse.ArgumentParser(description="Scrape Nebraska eviction hearings and defendant addresses to CSV.")
+    ap.add_argument("--date", required=True, help="hearing date, mm/dd/yyyy")
+    ap.add_argument("--through", help="last hearing date of a batch, mm/dd/yyyy")
+    ap.add_argument("--counties", default="metro",
+                    help="metro, top10, all, or a comma-separated list of county names (default: metro)")
+    ap.add_argument("--out", default=pipeline.desktop_folder(), help="output folder (default: Desktop)")
+    ap.add_argument("--per-date", action="store_true", help="write one CSV per hearing date")
+    ap.add_argument("--engine", choices=sorted(pipeline.ENGINES), default="threads")
+    ap.add_argument("--resume", action="store_true", help="skip work recorded by an earlier stopped run")
+    ap.add_argument("--no-cache", action="store_true", help="don't reuse cached docket pages")
+    ap.add_argument("--incremental", action="store_true",
+                    help="only write cases that are new or whose docket changed since the last run")
+    ap.add_argument("--db", nargs="?", const="", metavar="PATH",
+                    help=f"also save hearings, cases and parties to a SQLite database "
+                         f"(default PATH: {pipeline.CASE_DB_NAME} in the output folder)")
+    ap.add_argument("--parquet", action="store_true",
+                    help="also write each CSV as a typed Parquet file (needs pyarrow)")
+    ap.add_argument("--archive", nargs="?", const="", metavar="DIR",
+                    help=f"keep every raw calendar and docket page for --reparse "
+                         f"(default DIR: {pipeline.PAGE_ARCHIVE_DIR})")
+    ap.add_argument("--reparse", action="store_true",
+                    help="rebuild the output from the pages in the archive instead of scraping")
+    ap.add_argument("--parse-workers", type=int, metavar="N",
+                    help="processes parsing pages (default: one per CPU but one, up to 4; 0 = no extra processes)")
+    ap.add_argument("--credentials-file", help="ini file with [auth] username= and password=")
+    ap.add_argument("--quiet", action="store_true", help="only print phases, warnings and the result")
+    ap.add_argument("--debug", action="store_true", help="also print each docket's raw party block")
+    ap.add_argument("--progress-file", metavar="PATH",
+                    help="keep the run's phase, done/total counts and ETA in this JSON file")
+    return ap
+
+def _stamp():
+    return datetime.datetime.now().strftime("%H:%M:%S")
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        counties_list = resolve_counties(args.counties)
+        targetDates = pipeline.batch_dates(args.date, args.through)
+        username, password = load_credentials(args.credentials_file)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return EXIT_USAGE
+    if not args.reparse and (not username or not password):
+        print("error: no Justice credentials (use --credentials-file or NEJUSTICE_USERNAME/NEJUSTICE_PASSWORD)",
+              file=sys.stderr)
+        return EXIT_USAGE
+
+    def log(msg):
+        print(f"{_stamp()} {msg}", flush=True)
+
+    status = {"pid": os.getpid(), "state": "running", "phase": None, "progress": None, "updated": time.time()}
+    status_lock = threading.Lock()
+    last_print = [0.0]
+
+    def save_status(**changes):
+        with status_lock:
+            status.update(changes, updated=time.time())
+            if args.progress_file:
+                try:
+                    write_progress_file(args.progress_file, status)
+                except OSError as e:
+                    print(f"{_stamp()} [WARN] Could not write progress file: {e}", flush=True)
+
+    def event(kind, payload):
+        if kind == "phase":
+            print(f"{_stamp()} == {payload}", flush=True)
+            save_status(phase=payload)
+        elif kind == "progress":
+            now = time.monotonic()
+            edge = payload["done"] in (0, payload["total"])
+            if not args.quiet and (edge or now - last_print[0] >= PROGRESS_PRINT_SECS):
+                last_print[0] = now
+                print(f"{_stamp()} {format_progress(payload)}", flush=True)
+            save_status(progress=payload)
+
+    pipeline.set_reporter(log, event)
+    pipeline.set_log_level(pipeline.LOG_DEBUG if args.debug else pipeline.LOG_WARN if args.quiet else pipeline.LOG_INFO)
+    db_path = None
+    if args.db is not None:
+        db_path = args.db or os.path.join(args.out, pipeline.CASE_DB_NAME)
+    result = {}
+
+    def work():
+        try:
+            if args.reparse:
+                result["paths"] = pipeline.reparse_archive(
+                    counties_list, targetDates, args.out, archive_dir=args.archive, per_date=args.per_date,
+                    db_path=db_path, parquet=args.parquet,
+                    parse_workers=args.parse_workers if args.parse_workers is not None else pipeline.REPARSE_WORKERS)
+            else:
+                result["paths"] = pipeline.run_scrape(
+                    counties_list, targetDates, username, password, args.out,
+                    engine=args.engine, resume=args.resume,
+                    use_cache=not args.no_cache, per_date=args.per_date,
+                    incremental=args.incremental, db_path=db_path, parquet=args.parquet,
+                    parse_workers=args.parse_workers, archive_dir=args.archive)
+        except Exception as e:
+            result["error"] = e
+        finally:
+            finished.set()
+
+    def request_stop(signum, frame):
+        if not pipeline.CANCEL_EVENT.is_set():
+            print(f"{_stamp()} Stopping… will write partial CSV shortly.", flush=True)
+            pipeline.CANCEL_EVENT.set()
+
+    # The pipeline runs on a worker so Ctrl+C can request a graceful stop (partial CSV).
+    # SIGINT only sets the cancel flag; we keep waiting until the worker has returned.
+    finished = threading.Event()
+    worker = threading.Thread(target=work, daemon=True)
+    previous_handler = signal.signal(signal.SIGINT, request_stop)
+    try:
+        worker.start()
+        while not finished.wait(0.5):
+            pass
+        worker.join()
+    finally:
+        signal.signal(signal.SIGINT, previous_handler)
+
+    if "error" in result:
+        save_status(state="failed", error=str(result["error"]))
+        print(f"error: {result['error']}", file=sys.stderr)
+        return EXIT_FAILED
+    stopped = pipeline.CANCEL_EVENT.is_set()
+    paths = result.get("paths", [])
+    save_status(state="stopped" if stopped else "done", paths=paths)
+    for path in paths:
+        print(path, flush=True)
+    return EXIT_STOPPED if stopped else EXIT_OK
+
+if __name__ == "__main__":
+    sys.exit(main())
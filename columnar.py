@@ -0,0 +1,99 @@
+# Optional Parquet export of the scrape results (needs pyarrow).
+# Rows go out with typed columns: the hearing date as a date, county and change
+# as dictionary-encoded strings, the city/state/zip line split into its parts
+# and any further address lines as a list. Rows are buffered and written one
+# row group at a time, so a statewide batch never holds more than a row group
+# in memory, and the file is compressed column by column.
+
+import re
+import datetime
+
+try:
+    import pyarrow as pa  # optional: only needed for --parquet
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+ROW_GROUP_ROWS = 64 * 1024  # rows per Parquet row group
+COMPRESSION    = "zstd"
+
+_CITY_STATE_ZIP_RE = re.compile(r"^(.*?),?\s+([A-Z]{2})\s+(\d{5}(?:-\d{4})?)$")
+
+def available():
+    return pq is not None
+
+def schema(delta=False):
+    text = pa.string()
+    labels = pa.dictionary(pa.int32(), pa.string())
+    fields = [("change", labels)] if delta else []
+    fields += [
+        ("hearing_date", pa.date32()),
+        ("county", labels),
+        ("case_number", text),
+        ("name", text),
+        ("address", text),
+        ("city", text),
+        ("state", labels),
+        ("zip", text),
+        ("extra_address", pa.list_(text)),
+    ]
+    return pa.schema(fields)
+
+def split_city_state_zip(line):
+    """'OMAHA, NE 68105' -> ('OMAHA', 'NE', '68105'); anything else -> (line, None, None)."""
+    m = _CITY_STATE_ZIP_RE.match((line or "").strip())
+    if m is None:
+        return (line or "").strip() or None, None, None
+    return m.group(1).strip() or None, m.group(2), m.group(3)
+
+def parse_date(mmddyyyy):
+    try:
+        return datetime.datetime.strptime(mmddyyyy, "%m/%d/%Y").date()
+    except (TypeError, ValueError):
+        return None
+
+class ParquetRows:
+    """Writes DocketRow records to a Parquet file, one row group per ROW_GROUP_ROWS rows."""
+
+    def __init__(self, path, delta=False, row_group_rows=ROW_GROUP_ROWS):
+        if pq is None:
+            raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow).")
+        self.path = path
+        self.delta = delta
+        self.row_group_rows = row_group_rows
+        self.rows = 0
+        self.schema = schema(delta)
+        self._columns = {name: [] for name in self.schema.names}
+        self._writer = pq.ParquetWriter(path, self.schema, compression=COMPRESSION)
+
+    def add(self, row, hearing_date=None, change=None):
+        """One DocketRow; hearing_date is mm/dd/yyyy, change the delta label."""
+        city, state, zip_code = split_city_state_zip(row.city_state_zip)
+        cols = self._columns
+        if self.delta:
+            cols["change"].append(change)
+        cols["hearing_date"].append(parse_date(hearing_date))
+        cols["county"].append(row.county or None)
+        cols["case_number"].append(row.case_number or None)
+        cols["name"].append(row.name.strip() or None)
+        cols["address"].append(" ".join(row.address.split()) or None)
+        cols["city"].append(city)
+        cols["state"].append(state)
+        cols["zip"].append(zip_code)
+        cols["extra_address"].append([line for line in row.extra if line.strip()])
+        self.rows += 1
+        if len(cols["case_number"]) >= self.row_group_rows:
+            self._flush()
+
+    def _flush(self):
+        if not self._columns["case_number"]:
+            return
+        batch = pa.table(self._columns, schema=self.schema)
+        self._writer.write_table(batch, row_group_size=self.row_group_rows)
+        self._columns = {name: [] for name in self.schema.names}
+
+    def close(self):
+        try:
+            self._flush()
+        finally:
+            self._writer.close()
@@ -0,0 +1,46 @@
+# Nebraska county tables shared by every stage of the scraper: the court's
+# county numbers, the reverse (number -> name) lookup, and the county sets the
+# GUI and CLI offer.
+
+county_numbers_dict = {"Adams" : "14",
+ "Antelope" : "26", "Arthur" : "91", "Banner" : "85", "Blaine" : "86", "Boone" : "23",
+ "Box Butte" : "65", "Boyd" : "63", "Brown" : "75", "Buffalo" : "09", "Burt" : "31",
+ "Butler" : "25", "Cass" : "20", "Cedar" : "13", "Chase" : "72", "Cherry" : "66",
+ "Cheyenne" : "39", "Clay" : "30", "Colfax" : "43", "Cuming" : "24", "Custer" : "04",
+ "Dakota" : "70", "Dawes" : "69", "Dawson" : "18", "Deuel" : "78", "Dixon" : "35",
+ "Dodge" : "05", "Douglas" : "01", "Dundy" : "76", "Fillmore" : "34", "Franklin" : "50",
+ "Frontier" : "60", "Furnas" : "38", "Gage" : "03", "Garden" : "77", "Garfield" : "83",
+ "Gosper" : "73", "Grant" : "92", "Greeley" : "62", "Hall" : "08", "Hamilton" : "28",
+ "Harlan" : "51", "Hayes" : "79", "Hitchcock" : "67", "Holt" : "36", "Hooker" : "93",
+ "Howard" : "49", "Jefferson" : "33", "Johnson" : "57", "Kearney" : "52", "Keith" : "68",
+ "Keya Paha" : "82", "Kimball" : "71", "Knox" : "12", "Lancaster" : "02", "Lincoln" : "15",
+ "Logan" : "87", "Loup" : "88", "Madison" : "07", "McPherson" : "90", "Merrick" : "46",
+ "Morrill" : "64", "Nance" : "58", "Nemaha" : "44", "Nuckolls" : "42", "Otoe" : "11",
+ "Pawnee" : "54", "Perkins" : "74", "Phelps" : "37", "Pierce" : "40", "Platte" : "10",
+ "Polk" : "41", "Red Willow" : "48", "Richardson" : "19", "Rock" : "81", "Saline" : "22",
+ "Sarpy" : "59", "Saunders" : "06", "Scotts Bluff" : "21", "Seward" : "16", "Sheridan" : "61",
+ "Sherman" : "56", "Sioux" : "80", "Stanton" : "53", "Thayer" : "32", "Thomas" : "89",
+ "Thurston" : "55", "Valley" : "47", "Washington" : "29", "Wayne" : "27", "Webster" : "45",
+ "Wheeler" : "84", "York" : "17"}
+
+# Reverse and case-insensitive lookups, built once
+county_names_dict = {number: name for name, number in county_numbers_dict.items()}
+county_names_by_lower = {name.lower(): name for name in county_numbers_dict}
+
+COUNTY_SETS = {
+    "metro": ["Douglas", "Lancaster", "Sarpy"],
+    "top10": ["Douglas", "Lancaster", "Sarpy", "Hall", "Buffalo", "Dodge", "Scotts Bluff", "Madison", "Platte", "Lincoln"],
+    "all":   ["Adams", "Antelope", "Arthur", "Banner", "Blaine", "Boone", "Box Butte", "Boyd", "Brown", "Buffalo", "Burt", "Butler", "Cass", "Cedar", "Chase", "Cherry", "Cheyenne", "Clay", "Colfax", "Cuming", "Custer", "Dakota", "Dawes", "Dawson", "Deuel", "Dixon", "Dodge", "Douglas", "Dundy", "Fillmore", "Franklin", "Frontier", "Furnas", "Gage", "Garden", "Garfield", "Gosper", "Grant", "Greeley", "Hall", "Hamilton", "Harlan", "Hayes", "Hitchcock", "Holt", "Hooker", "Howard", "Jefferson", "Johnson", "Kearney", "Keith", "Keya Paha", "Kimball", "Knox", "Lancaster", "Lincoln", "Logan", "Loup", "Madison", "McPherson", "Merrick", "Morrill", "Nance", "Nemaha", "Nuckolls", "Otoe", "Pawnee", "Perkins", "Phelps", "Pierce", "Platte", "Polk", "Red Willow", "Richardson", "Rock", "Saline", "Sarpy", "Saunders", "Scotts Bluff", "Seward", "Sheridan", "Sherman", "Sioux", "Stanton", "Thayer", "Thomas", "Thurston", "Valley", "Washington", "Wayne", "Webster", "Wheeler", "York"],
+}
+
+def resolve_counties(spec):
+    """County names for a COUNTY_SETS key or a comma-separated list of county names."""
+    if spec in COUNTY_SETS:
+        return list(COUNTY_SETS[spec])
+    counties = []
+    for part in spec.split(","):
+        name = county_names_by_lower.get(part.strip().lower())
+        if name is None:
+            raise ValueError(f"Unknown county: {part.strip()}")
+        counties.append(name)
+    return counties
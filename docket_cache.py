@@ -0,0 +1,153 @@
+# On-disk cache for Justice docket pages (justice/case.cgi).
+# Bodies live as files under the cache folder; a small SQLite index tracks
+# validators (ETag / Last-Modified), fetch time for the TTL, and last access
+# for LRU eviction once the folder grows past its size cap.
+
+import os
+import time
+import sqlite3
+import threading
+import urllib.parse
+
+DEFAULT_TTL_SECS  = 6 * 60 * 60          # serve without asking the server for this long
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024    # evict least recently used pages beyond this
+
+def case_key(url):
+    """Normalized cache key 'county-year-id' from a case URL, or None if it isn't one."""
+    try:
+        qs = urllib.parse.parse_qs(urllib.parse.urlparse(url).query)
+        cnum = (qs.get("county_num") or [""])[0].strip()
+        cy = (qs.get("case_year") or [""])[0].strip()
+        cid = (qs.get("case_id") or [""])[0].strip()
+    except Exception:
+        return None
+    if not (cnum and cy and cid):
+        return None
+    return f"{cnum}-{cy}-{cid}"
+
+class CacheEntry:
+    __slots__ = ("key", "body", "etag", "last_modified", "fetched_at", "fresh")
+
+    def __init__(self, key, body, etag, last_modified, fetched_at, fresh):
+        self.key = key
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+        self.fresh = fresh
+
+    def revalidation_headers(self):
+        """Conditional-GET headers, empty if the server never gave us validators."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+class DocketCache:
+    """Thread-safe TTL + LRU cache of docket page bodies keyed by case_key()."""
+
+    def __init__(self, root, ttl_secs=DEFAULT_TTL_SECS, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root
+        self.ttl_secs = ttl_secs
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        os.makedirs(root, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(root, "index.sqlite3"), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            " key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT,"
+            " fetched_at REAL NOT NULL, last_access REAL NOT NULL, size INTEGER NOT NULL)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS pages_lru ON pages(last_access)")
+        self._db.commit()
+        self._total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+
+    def _path(self, key):
+        return os.path.join(self.root, key + ".html")
+
+    def lookup(self, url):
+        """Cached entry for url (fresh or stale), or None. Counts a miss when absent."""
+        key = case_key(url)
+        if key is None:
+            return None
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, last_modified, fetched_at FROM pages WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            try:
+                with open(self._path(key), "rb") as f:
+                    body = f.read()
+            except OSError:
+                self._forget(key)
+                self.misses += 1
+                return None
+            now = time.time()
+            self._db.execute("UPDATE pages SET last_access = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            fresh = (now - row[2]) < self.ttl_secs
+            if fresh:
+                self.hits += 1
+            return CacheEntry(key, body, row[0], row[1], row[2], fresh)
+
+    def store(self, url, body, etag=None, last_modified=None):
+        key = case_key(url)
+        if key is None or not body:
+            return
+        path = self._path(key)
+        with self._lock:
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(body)
+            os.replace(tmp, path)
+            old = self._db.execute("SELECT size FROM pages WHERE key = ?", (key,)).fetchone()
+            now = time.time()
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages (key, etag, last_modified, fetched_at, last_access, size)"
+                " VALUES (?, ?, ?, ?, ?, ?)", (key, etag, last_modified, now, now, len(body)))
+            self._total += len(body) - (old[0] if old else 0)
+            self._evict()
+            self._db.commit()
+
+    def mark_revalidated(self, url):
+        """Server answered 304 Not Modified: restart the entry's TTL."""
+        key = case_key(url)
+        if key is None:
+            return
+        with self._lock:
+            now = time.time()
+            self._db.execute("UPDATE pages SET fetched_at = ?, last_access = ? WHERE key = ?", (now, now, key))
+            self._db.commit()
+            self.revalidated += 1
+
+    def _forget(self, key):
+        row = self._db.execute("SELECT size FROM pages WHERE key = ?", (key,)).fetchone()
+        if row:
+            self._total -= row[0]
+        self._db.execute("DELETE FROM pages WHERE key = ?", (key,))
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _evict(self):
+        if self._total <= self.max_bytes:
+            return
+        victims = self._db.execute("SELECT key FROM pages ORDER BY last_access ASC").fetchall()
+        for (key,) in victims:
+            if self._total <= self.max_bytes:
+                break
+            self._forget(key)
+
+    def stats_line(self):
+        return (f"Docket cache: {self.hits} fresh hits, {self.revalidated} revalidated, "
+                f"{self.misses} misses, {self._total // 1024} KB on disk.")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,141 @@
+# Parser for the party block of Justice docket pages (justice/case.cgi).
+# The parties and their addresses sit in the page's second <pre>, laid out in
+# two text columns: party lines on the left, attorney lines from the "Attorney"
+# header column rightwards. The block is cut out of the raw HTML with a compiled
+# pattern (no DOM), and parties are tokenized line by line with compiled
+# patterns, fast enough for bulk re-parses of thousands of cached dockets.
+
+import re
+import html
+
+from calendar_parser import decode_page
+
+_PRE_RE         = re.compile(r"<pre\b[^>]*>(.*?)</pre\s*>", re.S | re.I)
+_COMMENT_RE     = re.compile(r"<!--.*?-->", re.S)
+_TAG_RE         = re.compile(r"<[^>]*>")
+_ROLE_RE        = re.compile(r"(Plaintiff|Defendant|Petitioner|Respondent|Garnishee|Intervenor|Appellant|Appellee)\b")
+_RESET_RE       = re.compile(r"Limited Representation Attorney| owes |Alias is ")  # lines that end a party's own lines
+_LIMITED_RE     = re.compile(r"Limited Representation Attorney")                 # ...and start attorney lines in its column
+_PLACEHOLDER_RE = re.compile(r"ccupants|CCUPANTS|ll other|LL OTHER|ll Other|John Doe|Jane Doe|Real Name Unknown")
+
+class Party:
+    """One party from the block: role ("Defendant", ...), name, address lines and attorney lines."""
+    __slots__ = ("role", "name", "address", "attorney")
+
+    def __init__(self, role, name="", address=None, attorney=None):
+        self.role = role
+        self.name = name
+        self.address = address if address is not None else []
+        self.attorney = attorney if attorney is not None else []
+
+    @property
+    def is_placeholder(self):
+        """'All other occupants', 'John Doe' and the like rather than a named person."""
+        return bool(_PLACEHOLDER_RE.search(self.name))
+
+    def __repr__(self):
+        return f"Party({self.role!r}, {self.name!r}, {self.address!r}, {self.attorney!r})"
+
+def party_block(content):
+    """Text of the page's second <pre> (tags stripped, entities decoded), or None if there isn't one."""
+    page = decode_page(content or b"")
+    if "<!--" in page:
+        page = _COMMENT_RE.sub("", page)
+    blocks = _PRE_RE.finditer(page)
+    if next(blocks, None) is None:
+        return None
+    second = next(blocks, None)
+    if second is None:
+        return None
+    text = second.group(1)
+    if "<" in text:
+        text = _TAG_RE.sub("", text)
+    if "&" in text:
+        text = html.unescape(text)
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+def client_column(block):
+    """
+    (offset, lines): where "Attorney" first occurs in the block, and every line
+    cut to that width and stripped. No attorney header means no lines.
+    """
+    offset = block.find("Attorney")
+    if offset <= 0:
+        return offset, []
+    return offset, [line[:offset].strip() for line in block.splitlines()]
+
+def first_defendant_fields(lines):
+    """
+    The first defendant's lines from client_column() ("Defendant", name, address…),
+    with each further named co-defendant joined onto the name as ", NAME".
+    """
+    fields = []
+    started = False
+    defendants = 0
+    for i, line in enumerate(lines):
+        if _RESET_RE.search(line):
+            started = False
+        if "Defendant" in line:
+            started = True
+            defendants += 1
+            if defendants > 1:
+                nxt = lines[i + 1] if i + 1 < len(lines) else ""
+                if len(fields) > 1 and not _PLACEHOLDER_RE.search(nxt):
+                    fields[1] = fields[1] + ", " + nxt
+                continue
+        if started and defendants == 1:
+            fields.append(line)
+    return fields
+
+def parse_parties(block):
+    """Every party in a party block, in page order."""
+    lines = block.splitlines()
+    col = None
+    for line in lines:
+        at = line.find("Attorney")
+        if at > 0:
+            col = at
+            break
+    parties = []
+    current = None
+    closed = False   # a reset line ended the current party's own lines
+    limited = False  # ...and it was a limited-representation attorney, whose lines follow
+    for line in lines:
+        left = (line[:col] if col else line).strip()
+        right = line[col:].strip() if col else ""
+        role = _ROLE_RE.match(left)
+        if role:
+            current = Party(role.group(1))
+            parties.append(current)
+            closed = limited = False
+            if right and right != "Attorney":
+                current.attorney.append(right)
+            continue
+        if current is None:
+            continue
+        if not left and not right:
+            current = None
+            continue
+        if right:
+            current.attorney.append(right)
+        if not left:
+            continue
+        if _RESET_RE.search(left):
+            closed = True
+            limited = _LIMITED_RE.search(left) is not None
+            if limited:
+                current.attorney.append(left)
+        elif limited:
+            current.attorney.append(left)
+        elif closed:
+            continue
+        elif not current.name:
+            current.name = left
+        else:
+            current.address.append(left)
+    return parties
+
+def parse(content):
+    """Parties on a docket page ([] if it has no party block)."""
+    block = party_block(content)
+    return parse_parties(block) if block is not None else []
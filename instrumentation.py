@@ -0,0 +1,236 @@
+# Run instrumentation for the scraping pipeline.
+# Records wall time per phase, per-request latency (calendar vs docket) with a
+# histogram, bytes received, HTTP status counts, parse time per page, retries,
+# adaptive concurrency limits and cache outcomes. At the end of a run the numbers are written as a JSON run
+# report next to the CSV and condensed into a few status-log lines.
+
+import json
+import time
+import datetime
+import threading
+
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)  # histogram upper bounds
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, int(round(pct / 100.0 * (len(sorted_values) - 1)))))
+    return sorted_values[k]
+
+def _bucket_label(index):
+    if index < len(LATENCY_BUCKETS_MS):
+        return f"<={LATENCY_BUCKETS_MS[index]}ms"
+    return f">{LATENCY_BUCKETS_MS[-1]}ms"
+
+class RequestStats:
+    """Latency samples, bytes, statuses and failures for one kind of request."""
+
+    def __init__(self):
+        self.latencies_ms = []
+        self.bytes = 0
+        self.errors = 0
+        self.retries = 0
+        self.statuses = {}
+
+    def histogram(self):
+        counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        for ms in self.latencies_ms:
+            index = 0
+            while index < len(LATENCY_BUCKETS_MS) and ms > LATENCY_BUCKETS_MS[index]:
+                index += 1
+            counts[index] += 1
+        return {_bucket_label(i): n for i, n in enumerate(counts)}
+
+    def as_dict(self):
+        ordered = sorted(self.latencies_ms)
+        return {
+            "requests": len(ordered),
+            "errors": self.errors,
+            "retries": self.retries,
+            "bytes": self.bytes,
+            "statuses": {str(k): v for k, v in sorted(self.statuses.items())},
+            "latency_ms": {
+                "min": round(ordered[0], 1) if ordered else 0.0,
+                "mean": round(sum(ordered) / len(ordered), 1) if ordered else 0.0,
+                "p50": round(_percentile(ordered, 50), 1),
+                "p95": round(_percentile(ordered, 95), 1),
+                "max": round(ordered[-1], 1) if ordered else 0.0,
+            },
+            "histogram": self.histogram(),
+        }
+
+class ParseStats:
+    def __init__(self):
+        self.pages = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def as_dict(self):
+        return {
+            "pages": self.pages,
+            "total_ms": round(self.total_ms, 1),
+            "mean_ms": round(self.total_ms / self.pages, 2) if self.pages else 0.0,
+            "max_ms": round(self.max_ms, 2),
+        }
+
+class RunMetrics:
+    """
+    Thread-safe collector for one scrape. Phases are sequential: phase(name)
+    closes the running phase and opens the next; finish() closes the last one.
+    Anything can also be timed into a named bucket with timed(name).
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self, **info):
+        self._lock = threading.Lock()
+        self.started_at = datetime.datetime.now()
+        self._t0 = time.perf_counter()
+        self._phase = None
+        self._phase_t0 = None
+        self.phases = {}      # phase name -> seconds
+        self.timers = {}      # timed() bucket -> seconds
+        self.requests = {}    # kind -> RequestStats
+        self.parsing = {}     # kind -> ParseStats
+        self.counters = {}    # free-form counts (cache hits, rows written, ...)
+        self.limits = {}      # kind -> concurrency limit history
+        self.info = dict(info)
+        self.wall_secs = None
+
+    # ---- phases and timers ----
+    def phase(self, name):
+        now = time.perf_counter()
+        with self._lock:
+            self._close_phase(now)
+            self._phase, self._phase_t0 = name, now
+
+    def _close_phase(self, now):
+        if self._phase is not None:
+            self.phases[self._phase] = self.phases.get(self._phase, 0.0) + (now - self._phase_t0)
+            self._phase = None
+
+    def finish(self):
+        now = time.perf_counter()
+        with self._lock:
+            self._close_phase(now)
+            self.wall_secs = now - self._t0
+
+    def add_time(self, name, secs):
+        with self._lock:
+            self.timers[name] = self.timers.get(name, 0.0) + secs
+
+    def timed(self, name):
+        return _Timed(self, name)
+
+    # ---- requests, parsing, counters ----
+    def _requests(self, kind):
+        stats = self.requests.get(kind)
+        if stats is None:
+            stats = self.requests[kind] = RequestStats()
+        return stats
+
+    def request(self, kind, secs, nbytes=0, status=None):
+        """One completed HTTP exchange of `kind` ("calendar" / "docket")."""
+        with self._lock:
+            stats = self._requests(kind)
+            stats.latencies_ms.append(secs * 1000.0)
+            stats.bytes += nbytes or 0
+            if status is not None:
+                stats.statuses[status] = stats.statuses.get(status, 0) + 1
+
+    def request_failed(self, kind, secs=None):
+        with self._lock:
+            stats = self._requests(kind)
+            stats.errors += 1
+            if secs is not None:
+                stats.latencies_ms.append(secs * 1000.0)
+
+    def retry(self, kind):
+        with self._lock:
+            self._requests(kind).retries += 1
+
+    def limit(self, kind, value):
+        """The adaptive concurrency limit for `kind` is now `value`."""
+        with self._lock:
+            hist = self.limits.get(kind)
+            if hist is None:
+                self.limits[kind] = {"start": value, "final": value, "low": value, "peak": value, "changes": 0}
+                return
+            hist["final"] = value
+            hist["low"] = min(hist["low"], value)
+            hist["peak"] = max(hist["peak"], value)
+            hist["changes"] += 1
+
+    def parsed(self, kind, secs):
+        ms = secs * 1000.0
+        with self._lock:
+            stats = self.parsing.get(kind)
+            if stats is None:
+                stats = self.parsing[kind] = ParseStats()
+            stats.pages += 1
+            stats.total_ms += ms
+            stats.max_ms = max(stats.max_ms, ms)
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def set_count(self, name, value):
+        with self._lock:
+            self.counters[name] = value
+
+    # ---- output ----
+    def report(self):
+        with self._lock:
+            wall = self.wall_secs if self.wall_secs is not None else time.perf_counter() - self._t0
+            return {
+                "started_at": self.started_at.isoformat(timespec="seconds"),
+                "wall_secs": round(wall, 3),
+                "run": self.info,
+                "phases_secs": {k: round(v, 3) for k, v in self.phases.items()},
+                "timers_secs": {k: round(v, 3) for k, v in self.timers.items()},
+                "requests": {k: v.as_dict() for k, v in self.requests.items()},
+                "parsing": {k: v.as_dict() for k, v in self.parsing.items()},
+                "concurrency": {k: dict(v) for k, v in self.limits.items()},
+                "counters": dict(self.counters),
+            }
+
+    def write_report(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+        return path
+
+    def summary_lines(self):
+        rep = self.report()
+        lines = [f"Run took {rep['wall_secs']:.1f}s: "
+                 + ", ".join(f"{k} {v:.1f}s" for k, v in rep["phases_secs"].items())]
+        for kind, req in rep["requests"].items():
+            lat = req["latency_ms"]
+            lines.append(f"{kind.capitalize()} requests: {req['requests']} ({req['errors']} failed, "
+                         f"{req['retries']} retried), {req['bytes'] // 1024} KB, "
+                         f"p50 {lat['p50']:.0f} ms, p95 {lat['p95']:.0f} ms, max {lat['max']:.0f} ms")
+        for kind, parse in rep["parsing"].items():
+            lines.append(f"{kind.capitalize()} parsing: {parse['pages']} pages, "
+                         f"{parse['mean_ms']:.1f} ms avg, {parse['total_ms'] / 1000:.2f}s total")
+        for kind, hist in rep["concurrency"].items():
+            lines.append(f"{kind.capitalize()} concurrency: ended at {hist['final']} "
+                         f"(range {hist['low']}-{hist['peak']}, {hist['changes']} changes)")
+        if rep["timers_secs"]:
+            lines.append("Other: " + ", ".join(f"{k} {v:.2f}s" for k, v in rep["timers_secs"].items()))
+        return lines
+
+class _Timed:
+    __slots__ = ("metrics", "name", "t0")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.add_time(self.name, time.perf_counter() - self.t0)
+        return False
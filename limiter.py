@@ -0,0 +1,116 @@
+# Adaptive concurrency limit for requests to the court servers (AIMD).
+# Requests complete in windows; after each window the limit goes up by one if
+# the window was healthy and is halved if its p95 latency grew well past the
+# server's usual latency or too many requests failed. A 429/503 answer halves it
+# at once. Samples from requests sent before the last change are ignored, so
+# one slowdown isn't punished twice.
+
+import time
+import threading
+
+class AdaptiveLimiter:
+    """
+    Thread-safe limit on requests in flight, between `minimum` and `maximum`.
+    acquire()/try_acquire() take a slot, release() gives it back with the
+    request's outcome. on_change(limit, previous, p50_ms, p95_ms, error_rate, reason)
+    is called whenever the limit moves.
+    """
+    DECREASE = 0.5         # multiplicative decrease
+    BASELINE_DRIFT = 0.05  # how fast the usual latency follows a slower server
+
+    def __init__(self, initial=2, minimum=1, maximum=4, window=8, tolerance=3.0, max_error_rate=0.1,
+                 on_change=None):
+        self.minimum = max(1, int(minimum))
+        self.maximum = max(self.minimum, int(maximum))
+        self.limit = min(self.maximum, max(self.minimum, int(initial)))
+        self.window = max(1, int(window))
+        self.tolerance = tolerance
+        self.max_error_rate = max_error_rate
+        self.on_change = on_change
+        self.in_flight = 0
+        self.baseline_ms = None  # usual p50, from earlier windows
+        self.peak = self.low = self.limit
+        self.increases = self.decreases = 0
+        self._samples = []
+        self._errors = 0
+        self._changed_at = time.monotonic()
+        self._cond = threading.Condition()
+
+    def try_acquire(self):
+        with self._cond:
+            if self.in_flight >= self.limit:
+                return False
+            self.in_flight += 1
+            return True
+
+    def acquire(self, cancel=None, poll=0.25):
+        """Block until a slot is free. Returns False if `cancel` fires first."""
+        with self._cond:
+            while self.in_flight >= self.limit:
+                if cancel is not None and cancel.is_set():
+                    return False
+                self._cond.wait(poll)
+            self.in_flight += 1
+            return True
+
+    def release(self, secs=None, failed=False, throttled=False):
+        """
+        Give a slot back. secs is the request's latency (None if it was never
+        sent); failed marks a timeout, reset or 5xx, throttled a 429/503.
+        """
+        with self._cond:
+            self.in_flight -= 1
+            if secs is not None and time.monotonic() - secs >= self._changed_at:
+                if throttled:
+                    self._decrease(self._stats(), "server asked to slow down")
+                else:
+                    self._samples.append(secs * 1000.0)
+                    self._errors += 1 if failed else 0
+                    if len(self._samples) >= max(self.window, self.limit):
+                        self._decide()
+            self._cond.notify_all()
+
+    def _stats(self):
+        ordered = sorted(self._samples)
+        if not ordered:
+            return 0.0, 0.0, 0.0
+        p50 = ordered[len(ordered) // 2]
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        return p50, p95, self._errors / len(ordered)
+
+    def _decide(self):
+        stats = p50, p95, error_rate = self._stats()
+        slow = self.baseline_ms is not None and p95 > self.tolerance * self.baseline_ms
+        if self.baseline_ms is None or p50 < self.baseline_ms:
+            self.baseline_ms = p50
+        else:
+            self.baseline_ms += (p50 - self.baseline_ms) * self.BASELINE_DRIFT
+        if error_rate > self.max_error_rate:
+            self._decrease(stats, f"{error_rate:.0%} of requests failed")
+        elif slow:
+            self._decrease(stats, f"p95 {p95:.0f} ms is over {self.tolerance:g}x the usual {self.baseline_ms:.0f} ms")
+        elif self.limit < self.maximum:
+            self._set(self.limit + 1, stats, "latency is steady")
+            self.increases += 1
+        else:
+            self._reset_window()
+
+    def _decrease(self, stats, reason):
+        if self.limit > self.minimum:
+            self._set(max(self.minimum, int(self.limit * self.DECREASE)), stats, reason)
+            self.decreases += 1
+        else:
+            self._reset_window()
+
+    def _set(self, limit, stats, reason):
+        previous, self.limit = self.limit, limit
+        self.peak = max(self.peak, limit)
+        self.low = min(self.low, limit)
+        self._changed_at = time.monotonic()
+        self._reset_window()
+        if self.on_change is not None:
+            self.on_change(limit, previous, *stats, reason)
+
+    def _reset_window(self):
+        self._samples = []
+        self._errors = 0
@@ -0,0 +1,262 @@
+# Archive of the raw calendar and docket pages the scraper has parsed.
+# Each page body is stored once, under its content hash, appended to a pack
+# file (packs/<n>.pack, one or more per session) and compressed with zstd when
+# the zstandard package is installed (zlib otherwise). Court pages share most
+# of their markup, so once DICT_TRAIN_SAMPLES pages of a kind are stored a
+# zstd dictionary is trained from them and later pages of that kind are
+# compressed against it. A SQLite index records every time a page was seen:
+# kind, URL, page key (case key for dockets, county for calendars), hearing
+# date and time, plus where each body lives. Packs are read through mmap, so
+# bulk scans (pipeline.reparse_archive) don't copy whole files. Loose
+# zlib files (objects/<xx>/<hash>) from older archives are still read.
+
+import os
+import mmap
+import time
+import zlib
+import sqlite3
+import hashlib
+import datetime
+import threading
+
+try:
+    import zstandard  # optional: smaller archives, and dictionaries
+except ImportError:
+    zstandard = None
+
+COMPRESS_LEVEL     = 6                   # zlib level, without zstandard
+ZSTD_LEVEL         = 9
+DICT_SIZE          = 64 * 1024           # bytes per trained dictionary
+DICT_TRAIN_SAMPLES = 200                 # new pages of a kind to collect before training its dictionary
+PACK_MAX_BYTES     = 256 * 1024 * 1024   # start a new pack file beyond this
+BATCH_ROWS         = 200                 # index rows per commit
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS blobs ("
+    " digest TEXT PRIMARY KEY, size INTEGER NOT NULL, stored_size INTEGER NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS pages ("
+    " kind TEXT NOT NULL, page_key TEXT NOT NULL, hearing_date TEXT, url TEXT NOT NULL,"
+    " fetched_at REAL NOT NULL, digest TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS packs (id INTEGER PRIMARY KEY AUTOINCREMENT, created REAL NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS dicts ("
+    " id INTEGER PRIMARY KEY AUTOINCREMENT, kind TEXT NOT NULL, data BLOB NOT NULL, created REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS pages_latest ON pages(kind, page_key, hearing_date, fetched_at)",
+    "CREATE INDEX IF NOT EXISTS pages_url ON pages(url, fetched_at)",
+)
+_BLOB_COLUMNS = (("pack", "INTEGER"), ("offset", "INTEGER"), ("codec", "TEXT"), ("dict_id", "INTEGER"))
+
+def available_codec():
+    return "zstd" if zstandard is not None else "zlib"
+
+class PageArchive:
+    """Thread-safe content-addressed page store with a fetch index."""
+
+    def __init__(self, root):
+        self.root = root
+        self.codec = available_codec()
+        self.added = 0          # pages recorded this session
+        self.stored = 0         # of which were new bodies
+        self.stored_bytes = 0   # compressed bytes written this session
+        self._pending = 0
+        self._pack_id = None    # this session's pack; never shared with another session
+        self._pack_file = None
+        self._maps = {}         # pack id -> mmap, for packs this session isn't writing
+        self._dicts = {}        # dict id -> zstandard.ZstdCompressionDict
+        self._compressors = {}  # kind -> (dict id, compressor or None until first used)
+        self._plain = None      # zstd compressor for kinds without a dictionary yet
+        self._samples = {}      # kind -> bodies kept to train its dictionary
+        self._local = threading.local()
+        os.makedirs(os.path.join(root, "packs"), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(root, "index.sqlite3"), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        for statement in _SCHEMA:
+            self._db.execute(statement)
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(blobs)")}
+        for name, sql_type in _BLOB_COLUMNS:
+            if name not in columns:
+                self._db.execute(f"ALTER TABLE blobs ADD COLUMN {name} {sql_type}")  # archives from before packs
+        self._db.commit()
+        if zstandard is not None:
+            for dict_id, kind in self._db.execute("SELECT id, kind FROM dicts ORDER BY id"):
+                self._compressors[kind] = (dict_id, None)  # newest dictionary per kind wins
+
+    @staticmethod
+    def digest(body):
+        return hashlib.blake2b(body, digest_size=20).hexdigest()
+
+    def _loose_path(self, digest):
+        return os.path.join(self.root, "objects", digest[:2], digest[2:])
+
+    def _pack_path(self, pack_id):
+        return os.path.join(self.root, "packs", f"{pack_id:06d}.pack")
+
+    # ---------- Writing ----------
+    def add(self, kind, url, page_key, body, hearing_date=None):
+        """Record one page ("calendar" or "docket"); its body is written only if the archive doesn't have it."""
+        if not body:
+            return None
+        digest = self.digest(body)
+        with self._lock:
+            known = self._db.execute("SELECT 1 FROM blobs WHERE digest = ?", (digest,)).fetchone()
+            if known is None:
+                self._store(kind, digest, body)
+            self._db.execute(
+                "INSERT INTO pages (kind, page_key, hearing_date, url, fetched_at, digest) VALUES (?, ?, ?, ?, ?, ?)",
+                (kind, page_key, _iso_date(hearing_date), url, time.time(), digest))
+            self.added += 1
+            self._pending += 1
+            if self._pending >= BATCH_ROWS:
+                self._commit()
+        return digest
+
+    def _store(self, kind, digest, body):
+        dict_id, data = self._compress(kind, body)
+        if self._pack_file is None or self._pack_file.tell() + len(data) > PACK_MAX_BYTES:
+            self._new_pack()
+        offset = self._pack_file.tell()
+        self._pack_file.write(data)
+        self._db.execute(
+            "INSERT OR IGNORE INTO blobs (digest, size, stored_size, pack, offset, codec, dict_id)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)", (digest, len(body), len(data), self._pack_id, offset, self.codec, dict_id))
+        self.stored += 1
+        self.stored_bytes += len(data)
+        if zstandard is not None and kind not in self._compressors:
+            samples = self._samples.setdefault(kind, [])
+            samples.append(body)
+            if len(samples) >= DICT_TRAIN_SAMPLES:
+                self._train(kind)
+
+    def _compress(self, kind, body):
+        if zstandard is None:
+            return None, zlib.compress(body, COMPRESS_LEVEL)
+        dict_id, compressor = self._compressors.get(kind, (None, None))
+        if dict_id is None:
+            if self._plain is None:
+                self._plain = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+            return None, self._plain.compress(body)
+        if compressor is None:
+            compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL, dict_data=self._dictionary(dict_id))
+            self._compressors[kind] = (dict_id, compressor)
+        return dict_id, compressor.compress(body)
+
+    def _train(self, kind):
+        samples = self._samples.pop(kind)
+        try:
+            trained = zstandard.train_dictionary(DICT_SIZE, samples)
+        except Exception:
+            return  # too little to learn from; try again with the next batch of samples
+        cur = self._db.execute("INSERT INTO dicts (kind, data, created) VALUES (?, ?, ?)",
+                               (kind, trained.as_bytes(), time.time()))
+        self._dicts[cur.lastrowid] = trained
+        self._compressors[kind] = (cur.lastrowid, None)
+
+    def _new_pack(self):
+        if self._pack_file is not None:
+            self._pack_file.close()
+        cur = self._db.execute("INSERT INTO packs (created) VALUES (?)", (time.time(),))
+        self._db.commit()  # claim the pack id before anyone else can
+        self._pack_id = cur.lastrowid
+        self._pack_file = open(self._pack_path(self._pack_id), "ab")
+
+    def _commit(self):
+        if self._pack_file is not None:
+            self._pack_file.flush()  # bodies reach the pack before the index points at them
+        self._db.commit()
+        self._pending = 0
+
+    # ---------- Reading ----------
+    def _dictionary(self, dict_id):
+        zdict = self._dicts.get(dict_id)
+        if zdict is None:
+            row = self._db.execute("SELECT data FROM dicts WHERE id = ?", (dict_id,)).fetchone()
+            zdict = self._dicts[dict_id] = zstandard.ZstdCompressionDict(row[0])
+        return zdict
+
+    def _decompressor(self, dict_id):
+        cache = self._local.__dict__.setdefault("decompressors", {})
+        decompressor = cache.get(dict_id)
+        if decompressor is None:
+            with self._lock:
+                dict_data = self._dictionary(dict_id) if dict_id is not None else None
+            decompressor = cache[dict_id] = zstandard.ZstdDecompressor(dict_data=dict_data)
+        return decompressor
+
+    def _read_packed(self, pack_id, offset, size):
+        if pack_id == self._pack_id:
+            self._pack_file.flush()
+            with open(self._pack_path(pack_id), "rb") as f:
+                f.seek(offset)
+                return f.read(size)
+        view = self._maps.get(pack_id)
+        if view is None or offset + size > len(view):
+            with open(self._pack_path(pack_id), "rb") as f:
+                view = self._maps[pack_id] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return view[offset:offset + size]
+
+    def get(self, digest):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT pack, offset, stored_size, codec, dict_id FROM blobs WHERE digest = ?", (digest,)).fetchone()
+            if row is None:
+                raise KeyError(digest)
+            pack_id, offset, size, codec, dict_id = row
+            if pack_id is None:
+                data = None
+            else:
+                data = self._read_packed(pack_id, offset, size)
+        if data is None:
+            with open(self._loose_path(digest), "rb") as f:
+                data = f.read()
+        if codec == "zstd":
+            if zstandard is None:
+                raise RuntimeError("This archived page needs the zstandard package (pip install zstandard).")
+            return self._decompressor(dict_id).decompress(data)
+        return zlib.decompress(data)
+
+    def latest(self, kind, page_key, hearing_date=None):
+        """Digest of the most recently archived page for page_key (and hearing date, for calendars), or None."""
+        with self._lock:
+            if hearing_date is None:
+                row = self._db.execute(
+                    "SELECT digest FROM pages WHERE kind = ? AND page_key = ? ORDER BY fetched_at DESC LIMIT 1",
+                    (kind, page_key)).fetchone()
+            else:
+                row = self._db.execute(
+                    "SELECT digest FROM pages WHERE kind = ? AND page_key = ? AND hearing_date = ?"
+                    " ORDER BY fetched_at DESC LIMIT 1", (kind, page_key, _iso_date(hearing_date))).fetchone()
+        return row[0] if row else None
+
+    def history(self, url):
+        """[(fetched_at, digest)] for every time url was archived, oldest first."""
+        with self._lock:
+            return self._db.execute("SELECT fetched_at, digest FROM pages WHERE url = ? ORDER BY fetched_at",
+                                    (url,)).fetchall()
+
+    def stats(self):
+        """{"pages": n, "bodies": n, "bytes": raw bytes, "stored_bytes": bytes on disk} over the whole archive."""
+        with self._lock:
+            pages = self._db.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+            bodies, size, stored = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(stored_size), 0) FROM blobs").fetchone()
+        return {"pages": pages, "bodies": bodies, "bytes": size, "stored_bytes": stored}
+
+    def close(self):
+        with self._lock:
+            try:
+                self._commit()
+            finally:
+                if self._pack_file is not None:
+                    self._pack_file.close()
+                for view in self._maps.values():
+                    view.close()
+                self._maps = {}
+                self._db.close()
+
+def _iso_date(mmddyyyy):
+    if mmddyyyy is None:
+        return None
+    try:
+        return datetime.datetime.strptime(mmddyyyy, "%m/%d/%Y").date().isoformat()
+    except ValueError:
+        return mmddyyyy
@@ -0,0 +1,112 @@
+# Page parsing in a pool of worker processes, off the fetch threads.
+# Fetchers hand raw page bytes to a ParsePool and the workers run the lxml and
+# regex parsers, sending back compact records (a calendar's case numbers, a
+# docket's fingerprint, CSV fields and parties) instead of trees or whole pages.
+# Parsing then isn't serialized behind the GIL with the network waits. At most
+# `max_pending` pages are queued or being parsed at once; callers block in
+# submit() beyond that, so a fast network or a bulk re-parse of cached pages
+# can't pile pages up in memory. With workers=0 pages are parsed in the caller.
+# Workers are spawned, not forked, so a script that starts a pool must guard
+# its entry point with `if __name__ == "__main__":`.
+
+import os
+import time
+import threading
+import multiprocessing
+import concurrent.futures
+
+import calendar_parser
+import docket_parser
+from case_store import fingerprint
+
+PARSE_MAX_WORKERS        = 4  # default pool size cap (one CPU is left for fetching and writing)
+PARSE_PENDING_PER_WORKER = 8  # pages queued per worker before submit() blocks
+
+def default_workers():
+    """Worker processes to use when not told: one per CPU but one, up to PARSE_MAX_WORKERS (0 on one CPU)."""
+    return max(0, min(PARSE_MAX_WORKERS, (os.cpu_count() or 1) - 1))
+
+class DocketParse:
+    """
+    A docket page's party block as a worker sends it back: its fingerprint,
+    the CSV fields for the first defendant (None if the block matched the
+    baseline fingerprint and wasn't parsed further), every Party (if asked for)
+    and the debug-log lines (if asked for).
+    """
+    __slots__ = ("fingerprint", "fields", "parties", "debug")
+
+    def __init__(self, fp, fields=None, parties=None, debug=()):
+        self.fingerprint = fp
+        self.fields = fields
+        self.parties = parties
+        self.debug = debug
+
+# ---------- Worker functions (run in the pool's processes) ----------
+def calendar_hits(content):
+    """((case_number, case_year, case_id), ...) for every eviction row, and the seconds it took."""
+    t0 = time.perf_counter()
+    hits = [(hit.case_number, hit.case_year, hit.case_id) for hit in calendar_parser.eviction_rows(content)]
+    return hits, time.perf_counter() - t0
+
+def docket_parse(content, baseline=None, parties=False, debug=False):
+    """(DocketParse, or None without a party block, and the seconds it took) for a docket page."""
+    t0 = time.perf_counter()
+    block = docket_parser.party_block(content)
+    if block is None:
+        return None, time.perf_counter() - t0
+    parsed = DocketParse(fingerprint(block))
+    if parties:
+        parsed.parties = docket_parser.parse_parties(block)
+    if baseline is None or parsed.fingerprint != baseline:
+        attorney_column_offset, addresslines = docket_parser.client_column(block)
+        parsed.fields = docket_parser.first_defendant_fields(addresslines)
+        if debug:
+            parsed.debug = ("Docket Party and Address Info" + block,
+                            "Client Info Ends at Text Column #" + str(attorney_column_offset),
+                            "Extracted Client Info:",
+                            str(addresslines))
+    return parsed, time.perf_counter() - t0
+
+# ---------- Pool ----------
+class ParsePool:
+    """
+    submit(fn, *args) -> Future and run(fn, *args) -> result for the worker
+    functions above. Thread-safe; submit() blocks while max_pending pages are
+    in flight.
+    """
+
+    def __init__(self, workers=0, max_pending=None):
+        self.workers = max(0, int(workers))
+        self.max_pending = max_pending or max(1, self.workers) * PARSE_PENDING_PER_WORKER
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor = None
+        if self.workers:
+            # Workers are started on demand from fetch threads; forking a threaded
+            # process can copy locks mid-use, so start them fresh with spawn.
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def submit(self, fn, *args):
+        if self._executor is None:
+            fut = concurrent.futures.Future()
+            try:
+                fut.set_result(fn(*args))
+            except Exception as e:
+                fut.set_exception(e)
+            return fut
+        self._slots.acquire()
+        try:
+            fut = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        fut.add_done_callback(lambda _fut: self._slots.release())
+        return fut
+
+    def run(self, fn, *args):
+        return self.submit(fn, *args).result()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,1507 @@
+# Scraping pipeline for the Nebraska Courts E-Services Scraper.
+# Everything here runs without a display: no tkinter, tkcalendar or winsound,
+# so it can be driven by the GUI (scraper.py) or headless from cli.py.
+# Progress goes through ui_log()/ui_event(); by default those feed the queues
+# the GUI polls, and set_reporter() redirects them (e.g. to stdout).
+
+import os
+import datetime
+import urllib.parse
+import threading
+import queue
+import time
+import collections
+import asyncio
+import concurrent.futures
+
+import requests
+from requests.adapters import HTTPAdapter
+try:
+    import aiohttp  # optional: only needed for the asyncio engine
+except ImportError:
+    aiohttp = None
+import csv
+
+from docket_cache import DocketCache
+from case_store import CaseStore
+from case_db import CaseDatabase
+from page_archive import PageArchive
+import columnar
+import parse_pool
+from parse_pool import ParsePool
+from checkpoint import CheckpointJournal, journal_path
+from instrumentation import RunMetrics
+from progress import ProgressTracker
+from counties import county_numbers_dict
+from records import CaseRef, CalendarEntry, DocketRow
+from retry import RetryPolicy, CircuitBreaker, RetryableStatus, RETRYABLE_STATUSES
+from limiter import AdaptiveLimiter
+
+CONFIG_DIR = os.path.join(os.getenv("APPDATA") or os.path.expanduser("~"), "NEJusticeScraper")
+
+# ---------- Logging queues ----------
+LOG_QUEUE = queue.Queue()
+EVENT_QUEUE = queue.Queue()
+CANCEL_EVENT = threading.Event()
+
+# Verbosity: messages below the current level are dropped before they reach a sink.
+LOG_DEBUG = 10   # raw docket text and parser internals
+LOG_INFO  = 20   # per-calendar and per-docket progress lines
+LOG_WARN  = 30   # [WARN]/[ERROR] lines, summaries
+LOG_LEVELS = {"debug": LOG_DEBUG, "normal": LOG_INFO, "quiet": LOG_WARN}
+
+_log_sink = LOG_QUEUE.put
+_event_sink = lambda kind, payload: EVENT_QUEUE.put((kind, payload))
+_log_level = LOG_INFO
+
+def set_reporter(log=None, event=None):
+    """Send ui_log(msg) to log(msg) and ui_event(kind, payload) to event(kind, payload) instead of the GUI queues."""
+    global _log_sink, _event_sink
+    _log_sink = log or LOG_QUEUE.put
+    _event_sink = event or (lambda kind, payload: EVENT_QUEUE.put((kind, payload)))
+
+def set_log_level(level):
+    """LOG_DEBUG, LOG_INFO or LOG_WARN (or a LOG_LEVELS name)."""
+    global _log_level
+    _log_level = LOG_LEVELS.get(level, level) if isinstance(level, str) else level
+
+def log_enabled(level):
+    """Guard for messages that are costly to build, e.g. `if log_enabled(LOG_DEBUG): ui_log(..., LOG_DEBUG)`."""
+    return level >= _log_level
+
+def ui_log(msg: str, level=LOG_INFO):
+    if level >= _log_level or msg.startswith(("[WARN]", "[ERROR]")):
+        _log_sink(msg)
+def ui_event(kind, payload=None): _event_sink(kind, payload)
+
+# ---------- Instrumentation ----------
+METRICS = RunMetrics()  # reset by run_scrape(); both engines record into it
+PROGRESS = ProgressTracker(lambda snapshot: ui_event("progress", snapshot))  # calendars/dockets done of total
+
+def report_run(out_paths, failed=False):
+    """Close the run's metrics, log the summary and write the JSON report beside the first of the CSVs written."""
+    METRICS.finish()
+    METRICS.info["outcome"] = "failed" if failed else ("stopped" if CANCEL_EVENT.is_set() else "done")
+    METRICS.info["csv"] = list(out_paths or [])
+    for line in METRICS.summary_lines():
+        ui_log(line)
+    if not out_paths:
+        return None
+    report_path = os.path.splitext(out_paths[0])[0] + "_report.json"
+    try:
+        METRICS.write_report(report_path)
+    except Exception as e:
+        ui_log(f"[WARN] Could not write run report: {e}")
+        return None
+    ui_log("Run report: " + report_path)
+    return report_path
+
+# ---------- Scraping logic ----------
+def validate(date_text):
+    try:
+        datetime.datetime.strptime(date_text, '%m/%d/%Y')
+    except ValueError:
+        raise ValueError("Incorrect Date format, should be mm/dd/yyyy")
+
+def desktop_folder():
+    return os.path.join(os.path.expanduser("~"), "Desktop")
+
+# ---------- CSV output ----------
+CSV_HEADERS = ['name', 'address', 'city state zip', 'case number', 'county']
+DELTA_CSV_HEADERS = ['change'] + CSV_HEADERS  # incremental runs: "new" or "changed" first
+
+def date_span(targetDates, fmt='%Y-%m-%d'):
+    """'2024-05-06' for one date, '2024-05-06_to_2024-05-10' for a batch."""
+    first = datetime.datetime.strptime(targetDates[0], '%m/%d/%Y').strftime(fmt)
+    if len(targetDates) == 1:
+        return first
+    return first + "_to_" + datetime.datetime.strptime(targetDates[-1], '%m/%d/%Y').strftime(fmt)
+
+def csv_filename(targetDates, partial=False, generated_on=None, changes=False):
+    generated_on = generated_on or datetime.datetime.now()
+    return ("eviction_cases_for_"
+            + date_span(targetDates)
+            + ("_changes" if changes else "")
+            + ("_partial" if partial else "")
+            + "_generated_on_"
+            + generated_on.strftime('%Y-%m-%d-%H-%M-%S')  # seconds: a resume soon after a stop mustn't reuse its name
+            + ".csv")
+
+def parquet_path(csv_path):
+    """The Parquet export written next to a CSV."""
+    return os.path.splitext(csv_path)[0] + ".parquet"
+
+def write_partial_csv(cases, restitution_cases, targetDates, out_dir, parquet=False):
+    """Write whatever we have to a _partial CSV (and its Parquet export with parquet=True)."""
+    try:
+        os.makedirs(out_dir, exist_ok=True)
+    except Exception:
+        pass
+
+    dates_by_case = case_dates(restitution_cases)
+    records = [(DocketRow.bare(case), dates_by_case.get(case.key, [None])[0]) for case in cases]
+
+    # If we had not reached docket fetch yet, fall back to the calendar entries
+    if not records and restitution_cases:
+        records = [(DocketRow.bare(entry.case), entry.hearing_date) for entry in restitution_cases]
+
+    # If truly nothing, just write headers
+    data = [CSV_HEADERS] + [record.as_csv() for record, _hearing_date in records]
+    out_path = os.path.join(out_dir or desktop_folder(), csv_filename(targetDates, partial=True))
+    with open(out_path, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f, quoting=csv.QUOTE_ALL).writerows(data)
+    if parquet:
+        rows = columnar.ParquetRows(parquet_path(out_path))
+        try:
+            for record, hearing_date in records:
+                rows.add(record, hearing_date)
+        finally:
+            rows.close()
+    return out_path
+
+def _stop_with_partial(cases, restitution_cases, targetDates, out_dir, parquet=False):
+    METRICS.phase("output")
+    ui_event("phase", "Stopping… writing partial CSV…")
+    out_paths = [write_partial_csv(cases, restitution_cases, targetDates, out_dir, parquet)]
+    ui_event("done", out_paths)
+    return out_paths
+# -------------------------------------------------------
+
+# ---------- HTTP session ----------
+HTTP_POOL_SIZE  = 8      # keep-alive connections held open per host
+HTTP_TIMEOUT    = 60     # seconds, for calls that don't pass their own timeout
+HTTP_KEEP_ALIVE = True
+
+class PooledAdapter(HTTPAdapter):
+    """HTTPAdapter with a default timeout and counters for connection reuse."""
+    def __init__(self, pool_size=HTTP_POOL_SIZE, timeout=HTTP_TIMEOUT):
+        self.timeout = timeout
+        self.requests_sent = 0
+        self._count_lock = threading.Lock()
+        super().__init__(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=True)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        with self._count_lock:
+            self.requests_sent += 1
+        return super().send(request, **kwargs)
+
+    def connection_stats(self):
+        """Return (requests sent, connections opened, requests that reused a connection)."""
+        opened = 0
+        pools = self.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                opened += pool.num_connections
+        return self.requests_sent, opened, max(0, self.requests_sent - opened)
+
+def open_http_session(pool_size=HTTP_POOL_SIZE, timeout=HTTP_TIMEOUT, keep_alive=HTTP_KEEP_ALIVE):
+    """One pooled session shared by the calendar and docket stages for a whole run."""
+    session = requests.Session()
+    adapter = PooledAdapter(max(pool_size, PER_HOST_LIMIT), timeout)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Connection"] = "keep-alive" if keep_alive else "close"
+    return session
+
+def log_connection_stats(session):
+    adapter = session.get_adapter("https://")
+    if isinstance(adapter, PooledAdapter):
+        sent, opened, reused = adapter.connection_stats()
+        METRICS.set_count("http_connections_opened", opened)
+        METRICS.set_count("http_connections_reused", reused)
+        ui_log(f"HTTP: {sent} requests over {opened} connections ({reused} reused).")
+
+# ---------- Concurrency ----------
+COURTS_BASE_URL  = 'https://www.nebraska.gov'
+CALENDAR_URL     = COURTS_BASE_URL + '/courts/calendar/index.cgi'
+CASE_URL         = COURTS_BASE_URL + '/justice/case.cgi'
+CALENDAR_WORKERS = 8   # calendar fetches in flight at once
+PER_HOST_LIMIT   = 4   # never more than this many open requests to one host
+CANCEL_POLL_SECS = 0.25
+
+# Calendar and docket requests each get an adaptive limit (AIMD) between
+# ADAPTIVE_MIN and PER_HOST_LIMIT, driven by the latency and errors they see.
+ADAPTIVE_START      = 2      # requests in flight per kind when a run starts
+ADAPTIVE_MIN        = 1
+ADAPTIVE_WINDOW     = 8      # completed requests per limit decision
+ADAPTIVE_TOLERANCE  = 2.0    # back off when a window's p95 passes this multiple of the usual p50
+ADAPTIVE_MAX_ERRORS = 0.10   # back off when more than this share of a window failed
+ADAPTIVE_POLL_SECS  = 0.02   # asyncio engine: how often a task waiting for a slot checks again
+
+_HOST_SLOTS = {}
+_HOST_SLOTS_LOCK = threading.Lock()
+
+_LIMITERS = {}
+
+def _log_limit(kind, limit, previous, p50, p95, error_rate, reason):
+    METRICS.limit(kind, limit)
+    ui_log(f"{kind.capitalize()} concurrency {previous} -> {limit} ({reason}; p50 {p50:.0f} ms, "
+           f"p95 {p95:.0f} ms, {error_rate:.0%} failed)")
+
+def request_limiter(kind):
+    """Shared AdaptiveLimiter for one kind of request (reset at the start of each run)."""
+    with _HOST_SLOTS_LOCK:
+        limiter = _LIMITERS.get(kind)
+        if limiter is None:
+            limiter = _LIMITERS[kind] = AdaptiveLimiter(
+                ADAPTIVE_START, ADAPTIVE_MIN, PER_HOST_LIMIT, ADAPTIVE_WINDOW,
+                ADAPTIVE_TOLERANCE, ADAPTIVE_MAX_ERRORS,
+                on_change=lambda *change: _log_limit(kind, *change))
+            METRICS.limit(kind, limiter.limit)
+        return limiter
+
+def _overloaded(status):
+    """(failed, throttled) for the limiter, from a response status."""
+    return status in RETRYABLE_STATUSES, status in (429, 503)
+
+def host_slot(url):
+    """Shared semaphore that caps concurrent requests to url's host."""
+    host = urllib.parse.urlparse(url).netloc.lower()
+    with _HOST_SLOTS_LOCK:
+        slot = _HOST_SLOTS.get(host)
+        if slot is None:
+            slot = _HOST_SLOTS[host] = threading.BoundedSemaphore(PER_HOST_LIMIT)
+        return slot
+
+# ---------- Retries ----------
+RETRY_ATTEMPTS       = 3       # tries per request, the first one included
+RETRY_BASE_DELAY     = 1.0     # seconds before the first retry; doubles each time, with full jitter
+RETRY_MAX_DELAY      = 30.0
+BREAKER_THRESHOLD    = 5       # consecutive failures before requests to a host are paused
+BREAKER_COOLDOWN     = 30.0    # seconds paused before one probe request; doubles while the host stays down
+BREAKER_MAX_COOLDOWN = 300.0
+BREAKER_MAX_TRIPS    = 6       # pauses in a row (about 12 minutes) before the host is given up on and the run stops
+
+RETRY = RetryPolicy(RETRY_ATTEMPTS, RETRY_BASE_DELAY, RETRY_MAX_DELAY)
+_HOST_BREAKERS = {}
+
+def _log_breaker(host, state, cooldown):
+    if state == CircuitBreaker.DOWN:
+        METRICS.count("breaker_trips")
+        METRICS.count("hosts_down")
+        ui_log(f"[ERROR] {host} is still down after {BREAKER_MAX_TRIPS} pauses; stopping the run.")
+        CANCEL_EVENT.set()  # the stages wind down and write a partial CSV
+    elif state == CircuitBreaker.OPEN:
+        METRICS.count("breaker_trips")
+        ui_log(f"[WARN] {host} keeps failing; pausing requests to it for {cooldown:.0f}s.")
+    elif state == CircuitBreaker.HALF_OPEN:
+        ui_log(f"Trying {host} again…")
+    else:
+        ui_log(f"{host} is responding again; resuming.")
+
+def host_breaker(url):
+    """Shared circuit breaker for url's host (reset at the start of each run)."""
+    host = urllib.parse.urlparse(url).netloc.lower()
+    with _HOST_SLOTS_LOCK:
+        breaker = _HOST_BREAKERS.get(host)
+        if breaker is None:
+            breaker = _HOST_BREAKERS[host] = CircuitBreaker(
+                BREAKER_THRESHOLD, BREAKER_COOLDOWN, BREAKER_MAX_COOLDOWN,
+                on_change=lambda state, cooldown: _log_breaker(host, state, cooldown),
+                max_trips=BREAKER_MAX_TRIPS)
+        return breaker
+
+def _log_retry(kind, url, reason, delay, attempt):
+    METRICS.retry(kind)
+    ui_log(f"[WARN] {kind.capitalize()} request failed ({reason}), retry {attempt + 1} of "
+           f"{RETRY.attempts - 1} in {delay:.1f}s: {url}")
+
+def get_with_retry(session, kind, url, bucket=None, **kwargs):
+    """
+    session.get(url, **kwargs) under RETRY and the host's circuit breaker, taking a
+    bucket token (if given), a slot from kind's adaptive limiter and a host slot
+    for each attempt. Returns the response, or None if canceled; raises the last
+    error, or RetryableStatus when a 5xx/429 answer outlasts the retries.
+    """
+    breaker = host_breaker(url)
+    limiter = request_limiter(kind)
+    for attempt in range(RETRY.attempts):
+        if CANCEL_EVENT.is_set():
+            return None  # e.g. a host went down: don't pile HostDown errors on the stop
+        ready, probe = breaker.wait(CANCEL_EVENT)
+        if not ready:
+            return None
+        if bucket is not None and not bucket.acquire(CANCEL_EVENT):
+            return None
+        if not limiter.acquire(CANCEL_EVENT, CANCEL_POLL_SECS):
+            return None
+        secs = failed = throttled = None
+        judged = False  # whether the breaker heard how this attempt went (matters for the probe)
+        try:
+            with host_slot(url):
+                if CANCEL_EVENT.is_set():
+                    return None
+                t0 = time.perf_counter()
+                try:
+                    response = session.get(url, **kwargs)
+                except Exception as e:
+                    secs = time.perf_counter() - t0
+                    METRICS.request_failed(kind, secs)
+                    if not RETRY.retryable_error(e):
+                        raise
+                    failed = judged = True
+                    breaker.record_failure(probe)
+                    if attempt + 1 >= RETRY.attempts:
+                        raise
+                    delay, reason = RETRY.backoff(attempt), str(e) or type(e).__name__
+                else:
+                    secs = time.perf_counter() - t0
+                    failed, throttled = _overloaded(response.status_code)
+                    METRICS.request(kind, secs, len(response.content), response.status_code)
+                    judged = True
+                    if not RETRY.retryable_status(response.status_code):
+                        breaker.record_success(probe)
+                        return response
+                    breaker.record_failure(probe)
+                    if attempt + 1 >= RETRY.attempts:
+                        METRICS.request_failed(kind)  # out of retries
+                        raise RetryableStatus(response.status_code)
+                    delay = RETRY.backoff(attempt, response.headers.get("Retry-After"))
+                    reason = f"HTTP {response.status_code}"
+        finally:
+            limiter.release(secs, failed, throttled)
+            if not judged:
+                breaker.release_probe(probe)
+        _log_retry(kind, url, reason, delay, attempt)
+        if CANCEL_EVENT.wait(delay):
+            return None
+
+def calendar_params(county, targetDate):
+    return [
+      ('court', 'C'),
+      ('countyC', county),
+      ('countyD', ''),
+      ('selectRadio', 'date'),
+      ('searchField', targetDate),
+      ('submitButton', 'Submit'),
+    ]
+
+def fetch_calendar(session, county, targetDate):
+    """Worker: download one county's calendar page, retrying transient failures (None if canceled)."""
+    return get_with_retry(session, "calendar", CALENDAR_URL,
+                          params=calendar_params(county, targetDate), timeout=45)
+
+def fetch_calendar_rows(session, county, targetDate):
+    """Worker: fetch_calendar() and parse_calendar_rows() (None if canceled)."""
+    response = fetch_calendar(session, county, targetDate)
+    if response is None:
+        return None
+    return parse_calendar_rows(response.content, county, targetDate)
+
+def parse_calendar_rows(content, county, targetDate):
+    """Return the CalendarEntry for every eviction hearing on one calendar page (parsed by PARSER)."""
+    archive_page("calendar", CALENDAR_URL + "?" + urllib.parse.urlencode(calendar_params(county, targetDate)),
+                 county, content, targetDate)
+    return calendar_entries(*PARSER.run(parse_pool.calendar_hits, content), county, targetDate)
+
+def calendar_entries(hits, secs, county, targetDate):
+    """parse_calendar_rows() from a worker's parse_pool.calendar_hits() result."""
+    found = []
+    county_num = county_numbers_dict.get(county)
+    METRICS.parsed("calendar", secs)
+    for case_number, case_year, case_id in hits:
+        if case_year is None:
+            ui_log(f"[WARN] Skipping unreadable case number {case_number!r} on the {county} county calendar.")
+            continue
+        ui_log(f"Adding {county} county case number {case_number} to the list to scrape.")
+        case_url = CASE_URL + '?search=1&from_case_search=1&court_type=C&county_num='
+        case_url += county_num
+        case_url += '&case_type=CI&case_year='
+        case_url += case_year
+        case_url += '&case_id='
+        case_url += case_id
+        case_url += '&client_data=&search=Search+Now'
+        found.append(CalendarEntry(CaseRef(case_url, county_num, case_year, case_id), county, targetDate))
+    return found
+
+def calendar_jobs(targetDates, counties_list):
+    """Every (date, county) calendar to fetch, date-major so rows come out in hearing order."""
+    return [(targetDate, county) for targetDate in targetDates for county in counties_list]
+
+def calendar_stage(session, counties_list, targetDates, restitution_cases, journal=None):
+    """
+    Fetch the calendar for every (date, county) pair through one bounded pool and
+    extend restitution_cases in date then county order. Returns False if
+    CANCEL_EVENT stopped the stage early; whatever was parsed before the stop is
+    still added so the partial CSV can use it. Calendars already in the checkpoint
+    journal are replayed instead of fetched.
+    """
+    jobs = calendar_jobs(targetDates, counties_list)
+    per_job = {}
+    PROGRESS.start("calendars", len(jobs))
+    pool = concurrent.futures.ThreadPoolExecutor(max_workers=CALENDAR_WORKERS)
+    try:
+        futures = {}
+        for job in jobs:
+            targetDate, county = job
+            if journal is not None and job in journal.calendars:
+                ui_log(f"Resuming: {targetDate} calendar for {county} county already retrieved.")
+                METRICS.count("calendars_from_journal")
+                per_job[job] = [CalendarEntry.from_json(rec) for rec in journal.calendars[job]]
+                PROGRESS.advance("calendars")
+                continue
+            ui_log(f"Getting case numbers for eviction cases (Restitution, Real Fed, FED or LLT is in description) for {targetDate} from the calendar for {county} county...")
+            futures[pool.submit(fetch_calendar_rows, session, county, targetDate)] = job
+        pending = set(futures)
+        while pending and not CANCEL_EVENT.is_set():
+            done, pending = concurrent.futures.wait(
+                pending, timeout=CANCEL_POLL_SECS, return_when=concurrent.futures.FIRST_COMPLETED)
+            for fut in done:
+                targetDate, county = job = futures[fut]
+                try:
+                    rows = fut.result()
+                except Exception as e:
+                    ui_log(f"[WARN] Calendar failed for {county} ({targetDate}): {e}")
+                    PROGRESS.advance("calendars")
+                    continue
+                if rows is not None:
+                    per_job[job] = rows
+                    if journal is not None:
+                        journal.calendar_done(targetDate, county, [entry.to_json() for entry in per_job[job]])
+                    PROGRESS.advance("calendars")
+    finally:
+        # Queued calendars are dropped on cancel; in-flight ones finish in the background.
+        pool.shutdown(wait=False, cancel_futures=True)
+    for job in jobs:
+        restitution_cases.extend(per_job.get(job, []))
+    return not CANCEL_EVENT.is_set()
+
+DOCKET_WORKERS = 6     # docket fetches in flight at once (still capped by PER_HOST_LIMIT)
+DOCKET_RATE    = 4.0   # sustained docket requests per second
+DOCKET_BURST   = 4     # requests allowed back-to-back before the rate applies
+NOT_RETRIEVED  = ['could not retrieve'] * 4
+UNCHANGED      = []    # fields of a docket an incremental run skipped (party block as last time)
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, holding at most `capacity`."""
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token if one is ready and return 0, else return seconds until the next one."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self, cancel=None):
+        """Block until a token is available. Returns False if `cancel` fires first."""
+        while True:
+            wait = self.reserve()
+            if wait <= 0:
+                return True
+            if cancel is None:
+                time.sleep(wait)
+            elif cancel.wait(wait):
+                return False
+
+def parse_docket(url, content):
+    """
+    Pull the first defendant's block out of a docket page. Returns the values to
+    append to that case's address row (joined co-defendant names included).
+    """
+    return read_docket(url, content)[0]
+
+def read_docket(url, content, store=None, db=None):
+    """
+    (fields, fingerprint) for a docket page, as parse_docket() plus the party
+    block's fingerprint (None without a block). In an incremental run a block
+    the case store already has is not parsed: fields is UNCHANGED. With a case
+    database, every party on the page is saved to it.
+    """
+    key = CaseRef.from_url(url).key
+    archive_page("docket", url, key, content)
+    baseline = store.baseline(key) if store is not None else None
+    parsed, secs = PARSER.run(parse_pool.docket_parse, content, baseline, db is not None, log_enabled(LOG_DEBUG))
+    return docket_result(url, parsed, secs, store, db)
+
+def docket_result(url, parsed, secs, store=None, db=None):
+    """read_docket() from a worker's parse_pool.docket_parse() result."""
+    METRICS.parsed("docket", secs)
+    key = CaseRef.from_url(url).key
+    if parsed is None:
+        ui_log("Could not find docket party and address info in case at " + url)
+        return list(NOT_RETRIEVED), None
+    for line in parsed.debug:
+        ui_log(line, LOG_DEBUG)
+    fp = parsed.fingerprint
+    if db is not None:
+        db.add_parties(key, parsed.parties)
+    if store is not None and store.unchanged(key, fp):
+        ui_log("Docket unchanged since the last run: " + url)
+        return UNCHANGED, fp
+    return parsed.fields, fp
+
+# ---------- Date batches ----------
+BATCH_MAX_DAYS      = 31     # longest date range one run will sweep
+BATCH_SKIP_WEEKENDS = True   # no hearings on the calendar on Saturdays/Sundays
+
+# ---------- Checkpoints ----------
+CHECKPOINT_DIR = os.path.join(CONFIG_DIR, "checkpoints")
+
+def open_journal(targetDates, resume):
+    try:
+        return CheckpointJournal(journal_path(CHECKPOINT_DIR, targetDates), resume=resume)
+    except Exception as e:
+        ui_log(f"[WARN] Checkpoint journal unavailable, this run can't be resumed: {e}")
+        return None
+
+def close_journal(journal, finished):
+    if journal is None:
+        return
+    if finished:
+        journal.discard()
+    else:
+        journal.close()
+
+# ---------- Docket cache ----------
+DOCKET_CACHE_DIR      = os.path.join(CONFIG_DIR, "docket_cache")
+DOCKET_CACHE_TTL_SECS = 6 * 60 * 60          # re-use a docket without asking the server for this long
+DOCKET_CACHE_MAX_MB   = 200                  # least recently used dockets are evicted beyond this
+
+def open_docket_cache():
+    try:
+        return DocketCache(DOCKET_CACHE_DIR, DOCKET_CACHE_TTL_SECS, DOCKET_CACHE_MAX_MB * 1024 * 1024)
+    except Exception as e:
+        ui_log(f"[WARN] Docket cache unavailable, fetching everything: {e}")
+        return None
+
+def close_docket_cache(cache):
+    if cache is not None:
+        METRICS.set_count("docket_cache_fresh_hits", cache.hits)
+        METRICS.set_count("docket_cache_revalidated", cache.revalidated)
+        METRICS.set_count("docket_cache_misses", cache.misses)
+        ui_log(cache.stats_line())
+        cache.close()
+
+# ---------- Parse pool ----------
+PARSE_WORKERS = None  # page-parsing worker processes (None = parse_pool.default_workers(), 0 = parse on the fetch threads)
+PARSER = ParsePool(0)  # replaced for each run by run_scrape()
+
+def open_parse_pool(workers):
+    global PARSER
+    workers = parse_pool.default_workers() if workers is None else workers
+    try:
+        PARSER = ParsePool(workers)
+    except Exception as e:
+        ui_log(f"[WARN] Parse pool unavailable, parsing on the fetch threads: {e}")
+        PARSER = ParsePool(0)
+    if PARSER.workers:
+        ui_log(f"Parsing pages in {PARSER.workers} worker processes.")
+    METRICS.info["parse_workers"] = PARSER.workers
+
+def close_parse_pool():
+    global PARSER
+    PARSER.close()
+    PARSER = ParsePool(0)
+
+# ---------- Page archive ----------
+PAGE_ARCHIVE_DIR = os.path.join(CONFIG_DIR, "page_archive")  # default archive folder
+REPARSE_WORKERS  = None  # re-parse processes (None = one per CPU, none on a single CPU)
+ARCHIVE = None  # the run's PageArchive while run_scrape() was given archive_dir
+
+def open_page_archive(path):
+    global ARCHIVE
+    if path is None:
+        return
+    try:
+        ARCHIVE = PageArchive(path or PAGE_ARCHIVE_DIR)
+    except Exception as e:
+        ui_log(f"[WARN] Page archive unavailable, raw pages won't be kept: {e}")
+
+def close_page_archive():
+    global ARCHIVE
+    archive, ARCHIVE = ARCHIVE, None
+    if archive is None:
+        return
+    try:
+        METRICS.set_count("archived_pages", archive.added)
+        METRICS.set_count("archived_bodies", archive.stored)
+        stats = archive.stats()
+        ui_log(f"Archived {archive.added} pages ({archive.stored} new, {archive.stored_bytes // 1024} KB {archive.codec}) "
+               f"in {archive.root}; it holds {stats['bodies']} distinct pages, "
+               f"{stats['stored_bytes'] / 1048576:.1f} MB on disk.")
+    finally:
+        archive.close()
+
+def archive_page(kind, url, page_key, body, hearing_date=None):
+    archive = ARCHIVE
+    if archive is None:
+        return
+    try:
+        archive.add(kind, url, page_key, body, hearing_date)
+    except Exception as e:
+        ui_log(f"[WARN] Could not archive {url}: {e}")
+
+# ---------- Case store ----------
+CASE_STORE_PATH = os.path.join(CONFIG_DIR, "case_store.sqlite3")
+
+def open_case_store(incremental):
+    try:
+        os.makedirs(os.path.dirname(CASE_STORE_PATH), exist_ok=True)
+        return CaseStore(CASE_STORE_PATH, incremental)
+    except Exception as e:
+        ui_log(f"[WARN] Case store unavailable{', writing every case' if incremental else ''}: {e}")
+        return None
+
+def close_case_store(store, finished):
+    """Save what a finished run saw (a stopped one keeps the old baseline for its resume)."""
+    if store is None:
+        return
+    try:
+        counts = store.counts()
+        for change, n in counts.items():
+            METRICS.set_count(f"cases_{change}", n)
+        if store.incremental:
+            ui_log(f"Since the last run: {counts['new']} new cases, {counts['changed']} changed dockets, "
+                   f"{counts['unchanged']} unchanged.")
+        if finished:
+            store.save()
+    except Exception as e:
+        ui_log(f"[WARN] Could not update the case store: {e}")
+    finally:
+        store.close()
+
+# ---------- Case database ----------
+CASE_DB_NAME = "eviction_cases.sqlite3"  # default database file, in the output folder
+
+def open_case_db(path):
+    if not path:
+        return None
+    try:
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        return CaseDatabase(path)
+    except Exception as e:
+        ui_log(f"[WARN] Case database unavailable, writing the CSV only: {e}")
+        return None
+
+def close_case_db(db):
+    if db is None:
+        return
+    try:
+        db.close()
+        for table, n in db.written.items():
+            METRICS.set_count(f"db_{table}", n)
+        ui_log(f"Saved {db.written['hearings']} hearings, {db.written['cases']} dockets and "
+               f"{db.written['parties']} parties to {db.path}")
+    except Exception as e:
+        ui_log(f"[WARN] Could not finish writing the case database: {e}")
+
+def save_hearings(db, restitution_cases):
+    if db is not None:
+        with METRICS.timed("db_write"):
+            db.add_hearings(restitution_cases)
+
+def delta_store(store):
+    """The store to build a delta CSV from, or None for a full CSV."""
+    return store if store is not None and store.incremental else None
+
+def _through_cache(cache, entry, url, status, headers, body):
+    """Record a docket response in the cache; returns the body to parse (cached copy on 304)."""
+    if cache is None:
+        return body
+    if status == 304 and entry is not None:
+        cache.mark_revalidated(url)
+        return entry.body
+    if status == 200:
+        cache.store(url, body, headers.get("ETag"), headers.get("Last-Modified"))
+    return body
+
+def retrieve_docket(session, url, username, password, bucket, cache=None, store=None, db=None):
+    """
+    Worker: rate-limited authenticated docket fetch + parse. Returns read_docket()'s
+    (fields, fingerprint), or None if canceled before sending.
+    """
+    entry = cache.lookup(url) if cache is not None else None
+    if entry is not None and entry.fresh:
+        ui_log("Using cached docket " + url)
+        return read_docket(url, entry.body, store, db)
+    ui_log("Retrieving " + url)
+    try:
+        docket_response = get_with_retry(session, "docket", url, bucket, auth=(username, password), timeout=60,
+                                          headers=entry.revalidation_headers() if entry else None)
+    except Exception as e:
+        ui_log(f"[WARN] Docket failed {url}: {e}")
+        return list(NOT_RETRIEVED), None
+    if docket_response is None:
+        return None
+    content = _through_cache(cache, entry, url, docket_response.status_code,
+                             docket_response.headers, docket_response.content)
+    return read_docket(url, content, store, db)
+
+def replay_journal_cases(cases, stream, journal, store=None):
+    """Stream rows for cases a previous attempt already parsed; returns their indexes."""
+    done = set()
+    if journal is None:
+        return done
+    for index, case in enumerate(cases):
+        fields = journal.cases.get(case.url)
+        if fields is not None:
+            if store is not None:
+                store.observe(case.key, journal.fingerprints.get(case.url))
+            with METRICS.timed("csv_write"):
+                stream.add(index, fields)
+            done.add(index)
+    METRICS.set_count("dockets_from_journal", len(done))
+    if done:
+        ui_log(f"Resuming: {len(done)} of {len(cases)} dockets already retrieved.")
+    return done
+
+def record_case(journal, store, case, fields, fp, db=None):
+    # Failed fetches are left out so a resumed run tries them again.
+    if store is not None:
+        store.observe(case.key, fp)
+    if db is not None:
+        row = None
+        if fields is not UNCHANGED and fields != NOT_RETRIEVED:
+            try:
+                row = DocketRow.from_fields(case, fields)
+            except Exception:
+                pass  # docket_record() warns about it when the CSV row is built
+        db.add_case(case, row, fp)
+    if journal is not None and fields != NOT_RETRIEVED:
+        journal.case_done(case.url, fields, fp)
+
+def docket_stage(session, cases, username, password, stream, cache=None, journal=None, store=None, db=None):
+    """
+    Fetch every docket through a bounded pool behind a shared TokenBucket and
+    hand each parsed row to `stream` with its calendar position, so the CSV keeps
+    the calendar order no matter which request finishes first. On cancel, queued
+    fetches are dropped, in-flight ones are drained and streamed; returns False.
+    """
+    replayed = replay_journal_cases(cases, stream, journal, store)
+    PROGRESS.start("dockets", len(cases), len(replayed))
+    bucket = TokenBucket(DOCKET_RATE, DOCKET_BURST)
+    pool = concurrent.futures.ThreadPoolExecutor(max_workers=DOCKET_WORKERS)
+    try:
+        futures = {pool.submit(retrieve_docket, session, case.url, username, password, bucket, cache, store, db): index
+                   for index, case in enumerate(cases) if index not in replayed}
+        pending = set(futures)
+        canceled = False
+        while pending:
+            if CANCEL_EVENT.is_set() and not canceled:
+                canceled = True
+                for fut in pending:
+                    fut.cancel()
+            done, pending = concurrent.futures.wait(
+                pending, timeout=CANCEL_POLL_SECS, return_when=concurrent.futures.FIRST_COMPLETED)
+            for fut in done:
+                if fut.cancelled():
+                    continue
+                case = cases[futures[fut]]
+                try:
+                    result = fut.result()
+                except Exception as e:
+                    ui_log(f"[WARN] Docket failed {case.url}: {e}")
+                    result = NOT_RETRIEVED, None
+                if result is not None:
+                    fields, fp = result
+                    record_case(journal, store, case, fields, fp, db)
+                    with METRICS.timed("csv_write"):
+                        stream.add(futures[fut], fields)
+                    PROGRESS.advance("dockets")
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    return not CANCEL_EVENT.is_set()
+
+class CaseIndex:
+    """Insertion-ordered set of cases keyed by CaseRef.key (county, year, case id); add() is O(1)."""
+    def __init__(self):
+        self.cases = []
+        self._positions = {}
+
+    def add(self, case):
+        """Position of the case, adding it at the end if it's new."""
+        position = self._positions.get(case.key)
+        if position is None:
+            position = self._positions[case.key] = len(self.cases)
+            self.cases.append(case)
+        return position
+
+    def __len__(self):
+        return len(self.cases)
+
+def dedupe_cases(restitution_cases):
+    """One CaseRef per distinct case, in calendar order (a case heard on several dates appears once)."""
+    index = CaseIndex()
+    for entry in restitution_cases:
+        index.add(entry.case)
+    return index.cases
+
+def docket_record(case, fields):
+    """DocketRow for one case's docket fields (bare if they can't be laid out)."""
+    try:
+        return DocketRow.from_fields(case, fields)
+    except Exception as e:
+        ui_log(f"[WARN] Could not tidy row for {case.url}: {e}")
+        return DocketRow.bare(case)
+
+def docket_row(case, fields):
+    """Final CSV columns for one case's docket fields."""
+    return docket_record(case, fields).as_csv()
+
+class CsvRowStream:
+    """
+    Writes each case's CSV row as soon as its docket is parsed, in calendar order
+    (rows that finish early wait in a small reorder buffer). The file keeps its
+    _partial_ name until finish(), so a crash leaves every row already written.
+    With a case store (incremental runs) it is a delta CSV: only cases the store
+    calls new or changed are written, with that in a leading "change" column.
+    With parquet=True the same rows also go to a Parquet file next to the CSV,
+    each with its hearing date (the first one in this file's dates, from
+    dates_by_case).
+    """
+    def __init__(self, cases, targetDates, out_dir, store=None, parquet=False, dates_by_case=None):
+        self.cases = cases
+        self.store = store
+        self.targetDates = targetDates
+        self.dates_by_case = dates_by_case or {}
+        try:
+            os.makedirs(out_dir, exist_ok=True)
+        except Exception:
+            pass
+        stamp = datetime.datetime.now()
+        delta = store is not None
+        self.partial_path = os.path.join(out_dir, csv_filename(targetDates, partial=True, generated_on=stamp,
+                                                               changes=delta))
+        self.final_path = os.path.join(out_dir, csv_filename(targetDates, generated_on=stamp, changes=delta))
+        self._f = open(self.partial_path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._f, quoting=csv.QUOTE_ALL)
+        self._writer.writerow(DELTA_CSV_HEADERS if delta else CSV_HEADERS)
+        self._f.flush()
+        self._parquet = columnar.ParquetRows(parquet_path(self.partial_path), delta) if parquet else None
+        self._pending = {}
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def _row(self, index, fields=None):
+        """(change, DocketRow) for a case (bare without fields), or None if a delta CSV leaves it out."""
+        case = self.cases[index]
+        record = docket_record(case, fields) if fields is not None else DocketRow.bare(case)
+        if self.store is None:
+            return None, record
+        change = self.store.change(case.key)
+        return (change, record) if change is not None else None
+
+    def _hearing_date(self, index):
+        if len(self.targetDates) == 1:
+            return self.targetDates[0]
+        return (self.dates_by_case.get(self.cases[index].key) or [None])[0]
+
+    def _write(self, index, row):
+        change, record = row
+        self._writer.writerow(([change] if self.store is not None else []) + record.as_csv())
+        if self._parquet is not None:
+            self._parquet.add(record, self._hearing_date(index), change)
+
+    def add(self, index, fields):
+        row = self._row(index, fields)
+        with self._lock:
+            self._pending[index] = row
+            self._drain()
+
+    def _drain(self):
+        wrote = False
+        while self._next in self._pending:
+            row = self._pending.pop(self._next)
+            if row is not None:
+                self._write(self._next, row)
+                wrote = True
+            self._next += 1
+        if wrote:
+            self._f.flush()
+
+    def _close(self):
+        self._f.close()
+        if self._parquet is not None:
+            self._parquet.close()
+
+    def abort(self):
+        """Stop early: write what's buffered plus bare case/county rows for the rest; keep the _partial_ name."""
+        with self._lock:
+            if not self._f.closed:
+                for index in range(self._next, len(self.cases)):
+                    row = self._pending.pop(index, None) if index in self._pending else self._row(index)
+                    if row is not None:
+                        self._write(index, row)
+                self._next = len(self.cases)
+                self._close()
+        return self.partial_path
+
+    def finish(self):
+        with self._lock:
+            self._drain()
+            self._close()
+        os.replace(self.partial_path, self.final_path)
+        if self._parquet is not None:
+            os.replace(self._parquet.path, parquet_path(self.final_path))
+            ui_log(f"Wrote {self._parquet.rows} rows to {parquet_path(self.final_path)}")
+        return self.final_path
+
+def case_dates(restitution_cases):
+    """CaseRef.key -> hearing dates the case shows up on, in calendar order."""
+    dates = {}
+    for entry in restitution_cases:
+        seen = dates.setdefault(entry.case.key, [])
+        if entry.hearing_date not in seen:
+            seen.append(entry.hearing_date)
+    return dates
+
+class CsvBatchOutput:
+    """
+    Output for a run over one or more dates: a single combined CsvRowStream, or
+    with per_date one stream per hearing date. Each docket is fetched once; in
+    per-date mode its row goes to every date the case is on the calendar for.
+    """
+    def __init__(self, cases, restitution_cases, targetDates, out_dir, per_date=False, store=None,
+                 parquet=False):
+        dates_by_case = case_dates(restitution_cases)
+        if not per_date or len(targetDates) == 1:
+            self.streams = [CsvRowStream(cases, targetDates, out_dir, store, parquet, dates_by_case)]
+            self.routes = [[(0, index)] for index in range(len(cases))]
+            return
+        slots = {targetDate: slot for slot, targetDate in enumerate(targetDates)}
+        cases_by_date = [[] for _ in targetDates]
+        self.routes = []
+        for case in cases:
+            route = []
+            for targetDate in dates_by_case.get(case.key, []):
+                slot = slots[targetDate]
+                route.append((slot, len(cases_by_date[slot])))
+                cases_by_date[slot].append(case)
+            self.routes.append(route)
+        self.streams = [CsvRowStream(date_cases, [targetDate], out_dir, store, parquet)
+                        for targetDate, date_cases in zip(targetDates, cases_by_date)]
+
+    def add(self, index, fields):
+        for slot, local_index in self.routes[index]:
+            self.streams[slot].add(local_index, fields)
+
+    def abort(self):
+        """Every stream's abort(); returns the list of _partial_ CSV paths."""
+        return [stream.abort() for stream in self.streams]
+
+    def finish(self):
+        """Every stream's finish(); returns the list of CSV paths."""
+        return [stream.finish() for stream in self.streams]
+
+def _finish_stream(stream, completed):
+    METRICS.phase("output")
+    if not completed:
+        ui_event("phase", "Stopping… writing partial CSV…")
+        out_paths = stream.abort()
+        ui_event("done", out_paths)
+        return out_paths
+    out_paths = stream.finish()
+    ui_log("Done.")
+    ui_event("done", out_paths)
+    return out_paths
+
+def batch_dates(first, last=None, skip_weekends=BATCH_SKIP_WEEKENDS):
+    """mm/dd/yyyy dates from first through last inclusive (just [first] without last)."""
+    validate(first)
+    if not last or last == first:
+        return [first]
+    validate(last)
+    day = datetime.datetime.strptime(first, '%m/%d/%Y').date()
+    end = datetime.datetime.strptime(last, '%m/%d/%Y').date()
+    if end < day:
+        raise ValueError("The end of the date range is before its start")
+    if (end - day).days + 1 > BATCH_MAX_DAYS:
+        raise ValueError(f"Date ranges are limited to {BATCH_MAX_DAYS} days")
+    dates = []
+    while day <= end:
+        if not (skip_weekends and day.weekday() >= 5):
+            dates.append(day.strftime('%m/%d/%Y'))
+        day += datetime.timedelta(days=1)
+    if not dates:
+        raise ValueError("The date range only covers a weekend")
+    return dates
+
+def scrape_threaded(counties_list, targetDates, username, password, out_dir,
+                    resume=False, use_cache=True, per_date=False, incremental=False, db_path=None,
+                    parquet=False):
+    """
+    Thread-pool engine. Uses CANCEL_EVENT for graceful stop.
+    With resume=True, work recorded in the run's checkpoint journal is skipped.
+    With incremental=True, only new and changed cases go to a delta CSV.
+    With db_path, hearings, cases and parties are also saved to that SQLite file.
+    With parquet=True each CSV gets a Parquet copy next to it.
+    Returns the CSV path(s) written; errors propagate to the caller.
+    """
+    session = None
+    cache = None
+    journal = None
+    store = None
+    db = None
+    finished = False
+    try:
+        restitution_cases = []
+        cases = []
+        session = open_http_session()
+        cache = open_docket_cache() if use_cache else None
+        journal = open_journal(targetDates, resume)
+        store = open_case_store(incremental)
+        db = open_case_db(db_path)
+
+        # calendar scrape (every date x county in parallel, capped per host)
+        METRICS.phase("calendars")
+        if not calendar_stage(session, counties_list, targetDates, restitution_cases, journal):
+            return _stop_with_partial(cases, restitution_cases, targetDates, out_dir, parquet)
+
+        METRICS.phase("dedupe")
+        ui_event("phase", "Deduplicating list…")
+        cases = dedupe_cases(restitution_cases)
+        METRICS.set_count("calendar_rows", len(restitution_cases))
+        METRICS.set_count("cases", len(cases))
+        save_hearings(db, restitution_cases)
+
+        # dockets (parallel, rate limited); each row is tidied and streamed to the CSV as it lands
+        METRICS.phase("dockets")
+        ui_event("phase", "Retrieving dockets…")
+        stream = CsvBatchOutput(cases, restitution_cases, targetDates, out_dir, per_date, delta_store(store),
+                                parquet)
+        try:
+            completed = docket_stage(session, cases, username, password, stream, cache, journal, store, db)
+        except Exception:
+            stream.abort()
+            raise
+        finished = completed
+        return _finish_stream(stream, completed)
+
+    finally:
+        if session is not None:
+            log_connection_stats(session)
+            session.close()
+        close_docket_cache(cache)
+        close_journal(journal, finished)
+        close_case_store(store, finished)
+        close_case_db(db)
+
+# ---------- Asyncio engine ----------
+async def _bucket_acquire_async(bucket):
+    while True:
+        wait = bucket.reserve()
+        if wait <= 0:
+            return True
+        if CANCEL_EVENT.is_set():
+            return False
+        await asyncio.sleep(min(wait, CANCEL_POLL_SECS))
+
+async def _limiter_acquire_async(limiter):
+    while not limiter.try_acquire():
+        if CANCEL_EVENT.is_set():
+            return False
+        await asyncio.sleep(ADAPTIVE_POLL_SECS)
+    return True
+
+async def _cancelable_sleep(secs):
+    """Sleep up to secs; returns False if CANCEL_EVENT fired first."""
+    end = time.monotonic() + secs
+    while not CANCEL_EVENT.is_set():
+        left = end - time.monotonic()
+        if left <= 0:
+            return True
+        await asyncio.sleep(min(left, CANCEL_POLL_SECS))
+    return False
+
+async def _get_with_retry_async(http, kind, url, bucket=None, **kwargs):
+    """get_with_retry() for aiohttp: (status, headers, body), or None if canceled."""
+    breaker = host_breaker(url)
+    limiter = request_limiter(kind)
+    for attempt in range(RETRY.attempts):
+        if CANCEL_EVENT.is_set():
+            return None
+        wait, probe = breaker.wait_time()
+        while wait > 0:
+            if not await _cancelable_sleep(min(wait, 1.0)):
+                return None
+            wait, probe = breaker.wait_time()
+        if bucket is not None and not await _bucket_acquire_async(bucket):
+            return None
+        if not await _limiter_acquire_async(limiter):
+            return None
+        secs = failed = throttled = None
+        judged = False
+        try:
+            if CANCEL_EVENT.is_set():
+                return None
+            t0 = time.perf_counter()
+            try:
+                async with http.get(url, **kwargs) as resp:
+                    body = await resp.read()
+            except Exception as e:
+                secs = time.perf_counter() - t0
+                METRICS.request_failed(kind, secs)
+                if not RETRY.retryable_error(e):
+                    raise
+                failed = judged = True
+                breaker.record_failure(probe)
+                if attempt + 1 >= RETRY.attempts:
+                    raise
+                delay, reason = RETRY.backoff(attempt), str(e) or type(e).__name__
+            else:
+                secs = time.perf_counter() - t0
+                failed, throttled = _overloaded(resp.status)
+                METRICS.request(kind, secs, len(body), resp.status)
+                judged = True
+                if not RETRY.retryable_status(resp.status):
+                    breaker.record_success(probe)
+                    return resp.status, resp.headers, body
+                breaker.record_failure(probe)
+                if attempt + 1 >= RETRY.attempts:
+                    METRICS.request_failed(kind)  # out of retries
+                    raise RetryableStatus(resp.status)
+                delay = RETRY.backoff(attempt, resp.headers.get("Retry-After"))
+                reason = f"HTTP {resp.status}"
+        finally:
+            limiter.release(secs, failed, throttled)
+            if not judged:
+                breaker.release_probe(probe)
+        _log_retry(kind, url, reason, delay, attempt)
+        if not await _cancelable_sleep(delay):
+            return None
+
+async def _gather_until_done(tasks):
+    """Wait for every task, waking up regularly so a Stop is noticed. Tasks check CANCEL_EVENT themselves."""
+    pending = set(tasks)
+    while pending:
+        _done, pending = await asyncio.wait(pending, timeout=CANCEL_POLL_SECS)
+
+async def _fetch_calendar_async(http, gate, county, targetDate, journal):
+    if journal is not None and (targetDate, county) in journal.calendars:
+        ui_log(f"Resuming: {targetDate} calendar for {county} county already retrieved.")
+        METRICS.count("calendars_from_journal")
+        PROGRESS.advance("calendars")
+        return [CalendarEntry.from_json(rec) for rec in journal.calendars[(targetDate, county)]]
+    try:
+        async with gate:
+            got = await _get_with_retry_async(http, "calendar", CALENDAR_URL, params=calendar_params(county, targetDate),
+                                              timeout=aiohttp.ClientTimeout(total=45))
+        if got is None:
+            return None
+        rows = await asyncio.to_thread(parse_calendar_rows, got[2], county, targetDate)
+    except Exception as e:
+        ui_log(f"[WARN] Calendar failed for {county} ({targetDate}): {e}")
+        PROGRESS.advance("calendars")
+        return None
+    if journal is not None:
+        journal.calendar_done(targetDate, county, [entry.to_json() for entry in rows])
+    PROGRESS.advance("calendars")
+    return rows
+
+async def _fetch_docket_async(http, gate, bucket, index, case, auth, cache, stream, journal, store, db):
+    url = case.url
+    entry = cache.lookup(url) if cache is not None else None
+    if entry is not None and entry.fresh:
+        ui_log("Using cached docket " + url)
+        content = entry.body
+    else:
+        content = await _download_docket_async(http, gate, bucket, url, auth, cache, entry)
+        if content is None:
+            return
+    try:
+        if content:
+            fields, fp = await asyncio.to_thread(read_docket, url, content, store, db)
+        else:
+            fields, fp = NOT_RETRIEVED, None
+    except Exception as e:
+        ui_log(f"[WARN] Docket failed {url}: {e}")
+        fields, fp = NOT_RETRIEVED, None
+    record_case(journal, store, case, fields, fp, db)
+    with METRICS.timed("csv_write"):
+        stream.add(index, fields)
+    PROGRESS.advance("dockets")
+
+async def _download_docket_async(http, gate, bucket, url, auth, cache, entry):
+    """Docket body, b"" if the request failed, or None if canceled before sending."""
+    async with gate:
+        if CANCEL_EVENT.is_set():
+            return None
+        ui_log("Retrieving " + url)
+        try:
+            got = await _get_with_retry_async(http, "docket", url, bucket, auth=auth,
+                                              timeout=aiohttp.ClientTimeout(total=60),
+                                              headers=entry.revalidation_headers() if entry else None)
+        except Exception as e:
+            ui_log(f"[WARN] Docket failed {url}: {e}")
+            return b""
+    if got is None:
+        return None
+    status, headers, body = got
+    return _through_cache(cache, entry, url, status, headers, body)
+
+async def _async_pipeline(counties_list, targetDates, username, password, restitution_cases, cases,
+                          open_stream, cache=None, journal=None, store=None, db=None):
+    """Calendar and docket phases on one event loop. Returns False if stopped early."""
+    connector = aiohttp.TCPConnector(limit=max(HTTP_POOL_SIZE, PER_HOST_LIMIT),
+                                     limit_per_host=PER_HOST_LIMIT,
+                                     force_close=not HTTP_KEEP_ALIVE)
+    async with aiohttp.ClientSession(connector=connector,
+                                     timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT)) as http:
+        METRICS.phase("calendars")
+        gate = asyncio.Semaphore(CALENDAR_WORKERS)
+        tasks = []
+        jobs = calendar_jobs(targetDates, counties_list)
+        PROGRESS.start("calendars", len(jobs))
+        for targetDate, county in jobs:
+            if journal is None or (targetDate, county) not in journal.calendars:
+                ui_log(f"Getting case numbers for eviction cases (Restitution, Real Fed, FED or LLT is in description) for {targetDate} from the calendar for {county} county...")
+            tasks.append(asyncio.create_task(_fetch_calendar_async(http, gate, county, targetDate, journal)))
+        await _gather_until_done(tasks)
+        for task in tasks:
+            restitution_cases.extend(task.result() or [])
+        if CANCEL_EVENT.is_set():
+            return False
+
+        METRICS.phase("dedupe")
+        ui_event("phase", "Deduplicating list…")
+        cases.extend(dedupe_cases(restitution_cases))
+        METRICS.set_count("calendar_rows", len(restitution_cases))
+        METRICS.set_count("cases", len(cases))
+        save_hearings(db, restitution_cases)
+
+        METRICS.phase("dockets")
+        ui_event("phase", "Retrieving dockets…")
+        stream = open_stream(cases, restitution_cases)
+        replayed = replay_journal_cases(cases, stream, journal, store)
+        PROGRESS.start("dockets", len(cases), len(replayed))
+        gate = asyncio.Semaphore(DOCKET_WORKERS)
+        bucket = TokenBucket(DOCKET_RATE, DOCKET_BURST)
+        auth = aiohttp.BasicAuth(username, password)
+        tasks = [asyncio.create_task(_fetch_docket_async(http, gate, bucket, index, case, auth, cache, stream,
+                                                         journal, store, db))
+                 for index, case in enumerate(cases) if index not in replayed]
+        await _gather_until_done(tasks)
+    return not CANCEL_EVENT.is_set()
+
+def scrape_asyncio(counties_list, targetDates, username, password, out_dir,
+                   resume=False, use_cache=True, per_date=False, incremental=False, db_path=None,
+                   parquet=False):
+    """
+    Asyncio engine: same stages, logs and events as scrape_threaded, but every
+    fetch is a task on one event loop (needs aiohttp).
+    """
+    if aiohttp is None:
+        raise RuntimeError("The asyncio engine needs aiohttp (pip install aiohttp).")
+    cache = None
+    journal = None
+    store = None
+    db = None
+    finished = False
+    streams = []
+    try:
+        def open_stream(cases, restitution_cases):
+            streams.append(CsvBatchOutput(cases, restitution_cases, targetDates, out_dir, per_date,
+                                          delta_store(store), parquet))
+            return streams[0]
+
+        restitution_cases = []
+        cases = []
+        cache = open_docket_cache() if use_cache else None
+        journal = open_journal(targetDates, resume)
+        store = open_case_store(incremental)
+        db = open_case_db(db_path)
+        completed = asyncio.run(_async_pipeline(counties_list, targetDates, username, password,
+                                                restitution_cases, cases, open_stream, cache, journal, store, db))
+        if not streams:
+            # stopped during the calendar phase
+            return _stop_with_partial(cases, restitution_cases, targetDates, out_dir, parquet)
+        finished = completed
+        return _finish_stream(streams[0], completed)
+
+    except Exception:
+        if streams:
+            streams[0].abort()
+        raise
+    finally:
+        close_docket_cache(cache)
+        close_journal(journal, finished)
+        close_case_store(store, finished)
+        close_case_db(db)
+
+ENGINES = {"threads": scrape_threaded, "asyncio": scrape_asyncio}
+
+def run_scrape(counties_list, targetDates, username, password, out_dir,
+               engine="threads", resume=False, use_cache=True, per_date=False, incremental=False,
+               db_path=None, parquet=False, parse_workers=PARSE_WORKERS, archive_dir=None):
+    """
+    Run one scrape end to end and return the list of CSV paths written. Stop it from
+    another thread with CANCEL_EVENT; it then writes a _partial_ CSV and returns.
+    With incremental=True the CSV only holds cases that are new since the last
+    run or whose docket party block changed. With db_path, everything found is
+    also upserted into that SQLite case database, and with parquet=True every
+    CSV gets a typed Parquet copy (needs pyarrow). Pages are parsed in
+    parse_workers processes (None: one per spare CPU; 0: on the fetch threads).
+    With archive_dir ("" for PAGE_ARCHIVE_DIR) every page parsed is also kept
+    in that page archive, for reparse_archive(). Timings and request stats go
+    to <csv>_report.json and the status log; done/total counts and an ETA are
+    published as ui_event("progress", snapshot) while it runs (see progress.py).
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine: {engine}")
+    if parquet and not columnar.available():
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow).")
+    METRICS.reset(engine=engine, dates=list(targetDates), counties=list(counties_list),
+                  resume=resume, use_cache=use_cache, per_date=per_date, incremental=incremental,
+                  db_path=db_path, parquet=parquet, archive_dir=archive_dir)
+    METRICS.phase("setup")
+    _HOST_BREAKERS.clear()
+    _LIMITERS.clear()
+    PROGRESS.reset()
+    ui_event("phase", "Processing…")
+    ui_log("Processing...")
+    if len(targetDates) > 1:
+        ui_log(f"Batch of {len(targetDates)} hearing dates: {', '.join(targetDates)}")
+    out_paths = None
+    open_parse_pool(parse_workers)
+    open_page_archive(archive_dir)
+    try:
+        out_paths = ENGINES[engine](counties_list, targetDates, username, password, out_dir,
+                                    resume=resume, use_cache=use_cache, per_date=per_date,
+                                    incremental=incremental, db_path=db_path, parquet=parquet)
+        return out_paths
+    finally:
+        close_parse_pool()
+        close_page_archive()
+        report_run(out_paths, failed=out_paths is None)
+
+# ---------- Re-parse from the page archive ----------
+def _parse_ahead(jobs, parse):
+    """
+    (item, future) for each (item, args) in jobs, in order, with PARSER working
+    up to PARSER.max_pending pages ahead of the caller.
+    """
+    window = collections.deque()
+    for item, args in jobs:
+        window.append((item, PARSER.submit(parse, *args)))
+        if len(window) >= PARSER.max_pending:
+            yield window.popleft()
+    while window:
+        yield window.popleft()
+
+def _archived_body(archive, digest):
+    try:
+        return archive.get(digest)
+    except Exception as e:
+        ui_log(f"[WARN] Archived page {digest} is unreadable: {e}")
+        return b""
+
+def reparse_calendars(archive, counties_list, targetDates):
+    """CalendarEntry rows from the latest archived calendar of every (date, county)."""
+    jobs = []
+    for targetDate, county in calendar_jobs(targetDates, counties_list):
+        digest = archive.latest("calendar", county, targetDate)
+        if digest is None:
+            ui_log(f"[WARN] No archived calendar for {county} county ({targetDate}).")
+        else:
+            jobs.append(((targetDate, county), digest))
+    PROGRESS.start("calendars", len(jobs))
+    restitution_cases = []
+    pages = (((targetDate, county), (_archived_body(archive, digest),)) for (targetDate, county), digest in jobs)
+    for (targetDate, county), fut in _parse_ahead(pages, parse_pool.calendar_hits):
+        if CANCEL_EVENT.is_set():
+            break
+        try:
+            restitution_cases.extend(calendar_entries(*fut.result(), county, targetDate))
+        except Exception as e:
+            ui_log(f"[WARN] Calendar failed for {county} ({targetDate}): {e}")
+        PROGRESS.advance("calendars")
+    return restitution_cases
+
+def reparse_dockets(archive, cases, stream, db=None):
+    """Stream rows parsed from the latest archived docket of every case. Returns False if stopped."""
+    PROGRESS.start("dockets", len(cases))
+    found = []
+    for index, case in enumerate(cases):
+        digest = archive.latest("docket", case.key)
+        if digest is None:
+            ui_log(f"[WARN] No archived docket for {case.url}")
+            stream.add(index, NOT_RETRIEVED)
+            PROGRESS.advance("dockets")
+        else:
+            found.append((index, digest))
+    debug = log_enabled(LOG_DEBUG)
+    pages = ((index, (_archived_body(archive, digest), None, db is not None, debug)) for index, digest in found)
+    for index, fut in _parse_ahead(pages, parse_pool.docket_parse):
+        if CANCEL_EVENT.is_set():
+            return False
+        case = cases[index]
+        try:
+            fields, fp = docket_result(case.url, *fut.result(), db=db)
+        except Exception as e:
+            ui_log(f"[WARN] Docket failed {case.url}: {e}")
+            fields, fp = NOT_RETRIEVED, None
+        record_case(None, None, case, fields, fp, db)
+        with METRICS.timed("csv_write"):
+            stream.add(index, fields)
+        PROGRESS.advance("dockets")
+    return not CANCEL_EVENT.is_set()
+
+def reparse_archive(counties_list, targetDates, out_dir, archive_dir=None, per_date=False, db_path=None,
+                    parquet=False, parse_workers=REPARSE_WORKERS):
+    """
+    Rebuild the CSV(s) for these dates and counties from the page archive with
+    the current parsers, without the network: the latest archived calendar of
+    every (date, county) and the latest archived docket of every case on them.
+    With db_path the rows also go to that case database. Returns the list of CSV paths.
+    """
+    if parquet and not columnar.available():
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow).")
+    archive_dir = archive_dir or PAGE_ARCHIVE_DIR
+    if not os.path.exists(os.path.join(archive_dir, "index.sqlite3")):
+        raise RuntimeError(f"No page archive in {archive_dir}")
+    METRICS.reset(engine="reparse", dates=list(targetDates), counties=list(counties_list), per_date=per_date,
+                  db_path=db_path, parquet=parquet, archive_dir=archive_dir)
+    METRICS.phase("setup")
+    PROGRESS.reset()
+    ui_event("phase", "Re-parsing archived pages…")
+    ui_log(f"Re-parsing archived pages from {archive_dir}")
+    if parse_workers is None:
+        parse_workers = os.cpu_count() if (os.cpu_count() or 1) > 1 else 0
+    out_paths = None
+    archive = PageArchive(archive_dir)
+    db = None
+    open_parse_pool(parse_workers)
+    try:
+        db = open_case_db(db_path)
+        METRICS.phase("calendars")
+        restitution_cases = reparse_calendars(archive, counties_list, targetDates)
+        if CANCEL_EVENT.is_set():
+            out_paths = _stop_with_partial([], restitution_cases, targetDates, out_dir, parquet)
+            return out_paths
+
+        METRICS.phase("dedupe")
+        cases = dedupe_cases(restitution_cases)
+        METRICS.set_count("calendar_rows", len(restitution_cases))
+        METRICS.set_count("cases", len(cases))
+        save_hearings(db, restitution_cases)
+
+        METRICS.phase("dockets")
+        ui_event("phase", "Re-parsing dockets…")
+        stream = CsvBatchOutput(cases, restitution_cases, targetDates, out_dir, per_date, None, parquet)
+        try:
+            completed = reparse_dockets(archive, cases, stream, db)
+        except Exception:
+            stream.abort()
+            raise
+        out_paths = _finish_stream(stream, completed)
+        return out_paths
+    finally:
+        close_parse_pool()
+        archive.close()
+        close_case_db(db)
+        report_run(out_paths, failed=out_paths is None)
+
@@ -0,0 +1,114 @@
+# Progress of a run in real work counts.
+# Each stage (calendars, then dockets) has a total and a done count; completions
+# are sampled so throughput is measured over a rolling window and the ETA
+# follows the server's current pace rather than the run's average. Snapshots
+# are published at most every `interval` seconds (and whenever a stage starts or
+# finishes), for the GUI's progress bar, the CLI and --progress-file.
+
+import time
+import threading
+import collections
+
+STAGE_LABELS = {"calendars": "Calendars", "dockets": "Dockets"}
+
+class ProgressTracker:
+    """
+    Thread-safe done/total counts per stage. publish(snapshot) gets a dict with
+    the current stage, done, total, percent, rate (per second over the last
+    `window` seconds), eta_secs (None until there is a rate), elapsed_secs,
+    idle_secs (since the last completion) and every stage's done/total.
+    """
+
+    def __init__(self, publish, interval=0.5, window=30.0):
+        self.publish = publish
+        self.interval = interval
+        self.window = window
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.stages = {}
+            self.stage = None
+            self._samples = collections.deque()  # (monotonic, done) for the current stage
+            self._stage_started = self._last_done = self._last_publish = time.monotonic()
+
+    def start(self, stage, total, done=0):
+        """Begin a stage; `done` counts work carried over (e.g. from a resumed run), left out of the rate."""
+        now = time.monotonic()
+        with self._lock:
+            self.stages[stage] = {"done": min(done, total), "total": total}
+            self.stage = stage
+            self._samples = collections.deque([(now, self.stages[stage]["done"])])
+            self._stage_started = self._last_done = now
+            snapshot = self._snapshot(now)
+            self._last_publish = now
+        self.publish(snapshot)
+
+    def advance(self, stage, n=1):
+        now = time.monotonic()
+        with self._lock:
+            counts = self.stages.get(stage)
+            if counts is None:
+                return
+            counts["done"] = min(counts["total"], counts["done"] + n)
+            self._last_done = now
+            if stage == self.stage:
+                self._samples.append((now, counts["done"]))
+                while len(self._samples) > 2 and now - self._samples[1][0] > self.window:
+                    self._samples.popleft()
+            if now - self._last_publish < self.interval and counts["done"] < counts["total"]:
+                return
+            snapshot = self._snapshot(now)
+            self._last_publish = now
+        self.publish(snapshot)
+
+    def rate(self, now=None):
+        """Completions per second over the rolling window, or 0.0 before there are two samples."""
+        with self._lock:
+            return self._rate(now or time.monotonic())
+
+    def _rate(self, now):
+        if len(self._samples) < 2:
+            return 0.0
+        t0, done0 = self._samples[0]
+        done1 = self._samples[-1][1]
+        secs = now - t0
+        return (done1 - done0) / secs if secs > 0 else 0.0
+
+    def _snapshot(self, now):
+        counts = self.stages.get(self.stage, {"done": 0, "total": 0})
+        rate = self._rate(now)
+        left = counts["total"] - counts["done"]
+        return {
+            "stage": self.stage,
+            "done": counts["done"],
+            "total": counts["total"],
+            "percent": round(100.0 * counts["done"] / counts["total"], 1) if counts["total"] else 100.0,
+            "rate": round(rate, 2),
+            "eta_secs": round(left / rate) if rate > 0 else (0 if left == 0 else None),
+            "elapsed_secs": round(now - self._stage_started, 1),
+            "idle_secs": round(now - self._last_done, 1),
+            "stages": {name: dict(c) for name, c in self.stages.items()},
+            "updated": time.time(),
+        }
+
+def format_eta(secs):
+    if secs is None:
+        return "estimating…"
+    secs = int(secs)
+    if secs < 1:
+        return "almost done"
+    if secs >= 3600:
+        return f"about {secs // 3600}h {secs % 3600 // 60:02d}m left"
+    if secs >= 60:
+        return f"about {secs // 60}m {secs % 60:02d}s left"
+    return f"about {secs}s left"
+
+def format_progress(snapshot):
+    """'Dockets 120/480 (25%), 4.1/s, about 1m 28s left'"""
+    label = STAGE_LABELS.get(snapshot["stage"], str(snapshot["stage"]).title())
+    text = f"{label} {snapshot['done']}/{snapshot['total']} ({snapshot['percent']:.0f}%)"
+    if snapshot["done"] >= snapshot["total"]:
+        return text
+    return f"{text}, {snapshot['rate']:.1f}/s, {format_eta(snapshot['eta_secs'])}"
@@ -0,0 +1,115 @@
+# Compact record types for the cases that move through the pipeline.
+# A case's identity (county number, year, case id) is parsed once, from the
+# calendar row or its docket URL's query, instead of being sliced out of the URL
+# at fixed character offsets, and each record holds only what later stages need.
+
+import urllib.parse
+
+from counties import county_names_dict
+
+class CaseRef:
+    """One court case: its docket URL and the identity it was built from."""
+    __slots__ = ("url", "county_num", "case_year", "case_id")
+
+    def __init__(self, url, county_num, case_year, case_id):
+        self.url = url
+        self.county_num = county_num
+        self.case_year = case_year
+        self.case_id = case_id
+
+    @classmethod
+    def from_url(cls, url):
+        try:
+            qs = urllib.parse.parse_qs(urllib.parse.urlparse(url).query)
+        except Exception:
+            qs = {}
+        def first(name):
+            return (qs.get(name) or [""])[0].strip()
+        return cls(url, first("county_num"), first("case_year"), first("case_id"))
+
+    @property
+    def key(self):
+        """'county-year-id' (as docket_cache.case_key), or the URL if the identity is incomplete."""
+        if self.county_num and self.case_year and self.case_id:
+            return f"{self.county_num}-{self.case_year}-{self.case_id}"
+        return self.url
+
+    @property
+    def case_number(self):
+        return f"{self.case_year}CI{self.case_id}" if self.case_year and self.case_id else ""
+
+    @property
+    def county(self):
+        return county_names_dict.get(self.county_num, "")
+
+    def __repr__(self):
+        return f"CaseRef({self.county!r}, {self.case_number!r})"
+
+class CalendarEntry:
+    """An eviction hearing found on a county calendar."""
+    __slots__ = ("case", "county", "hearing_date")
+
+    def __init__(self, case, county, hearing_date):
+        self.case = case
+        self.county = county
+        self.hearing_date = hearing_date
+
+    def to_json(self):
+        return [self.case.url, self.county, self.hearing_date]
+
+    @classmethod
+    def from_json(cls, rec):
+        if len(rec) > 3:
+            # checkpoint from an older version: the whole calendar row with
+            # county, case URL and hearing date appended at 7, 8 and 9
+            url, county, hearing_date = rec[8], rec[7], rec[9]
+        else:
+            url, county, hearing_date = rec
+        return cls(CaseRef.from_url(url), county, hearing_date)
+
+class DocketRow:
+    """One CSV row: the first defendant's name and address plus the case number and county."""
+    __slots__ = ("name", "address", "city_state_zip", "extra", "case_number", "county")
+
+    def __init__(self, name, address, city_state_zip, case_number, county, extra=()):
+        self.name = name
+        self.address = address
+        self.city_state_zip = city_state_zip
+        self.extra = extra
+        self.case_number = case_number
+        self.county = county
+
+    @classmethod
+    def from_fields(cls, case, fields):
+        """
+        Lay out docket_parser.first_defendant_fields() output ("Defendant", name,
+        address lines…) the way the CSV always has: two address lines joined in
+        the address column, the next line (whitespace squeezed) as city/state/zip,
+        then whatever lines follow (a lone trailing blank line is dropped).
+        Short blocks are padded with " ".
+        """
+        n = len(fields)
+        if n == 0:
+            return cls.bare(case)
+        extra = ()
+        if n >= 5:
+            name, line1, line2, last = fields[1], fields[2], fields[3], fields[4]
+            extra = tuple(fields[5:])
+            if extra == ("",):
+                extra = ()
+        elif n == 4:
+            name, line1, line2, last = fields[1], fields[2], " ", fields[3]
+        elif n == 3:
+            name, line1, line2, last = fields[1], " ", " ", fields[2]
+        else:
+            name, line1, line2, last = " ", " ", " ", fields[-1]
+        return cls(name, line1 + " " + line2, " ".join(last.split()),
+                   case.case_number, case.county, extra)
+
+    @classmethod
+    def bare(cls, case):
+        """Case number and county only, for cases whose docket wasn't parsed."""
+        return cls("", "", "", case.case_number, case.county)
+
+    def as_csv(self):
+        return [self.name, self.address, self.city_state_zip, *self.extra, self.case_number, self.county]
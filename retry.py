@@ -0,0 +1,163 @@
+# Retry policy and per-host circuit breaker for requests to the court servers.
+# Every request the scraper makes is an idempotent GET, so a timeout, a reset
+# connection or a 5xx/429 answer is retried after an exponential backoff with
+# full jitter. A host that keeps failing trips its breaker: requests to it wait
+# out a cooldown, then a single probe decides whether traffic resumes. After
+# max_trips trips in a row the breaker gives up and requests raise HostDown.
+
+import time
+import random
+import threading
+import asyncio
+
+import requests
+try:
+    import aiohttp  # optional, as in pipeline.py
+except ImportError:
+    aiohttp = None
+
+RETRYABLE_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+_TRANSIENT = [TimeoutError, ConnectionError, asyncio.TimeoutError,
+              requests.exceptions.Timeout, requests.exceptions.ConnectionError,
+              requests.exceptions.ChunkedEncodingError]
+if aiohttp is not None:
+    _TRANSIENT += [aiohttp.ClientConnectionError, aiohttp.ClientPayloadError]
+_TRANSIENT = tuple(_TRANSIENT)
+
+class RetryableStatus(Exception):
+    """The server still answered with a retryable status after the last attempt."""
+    def __init__(self, status):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+
+class HostDown(Exception):
+    """The host's breaker tripped max_trips times in a row without a successful probe."""
+
+class RetryPolicy:
+    def __init__(self, attempts=3, base_delay=1.0, max_delay=30.0):
+        self.attempts = max(1, int(attempts))
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def retryable_error(self, exc):
+        return isinstance(exc, _TRANSIENT)
+
+    def retryable_status(self, status):
+        return status in RETRYABLE_STATUSES
+
+    def backoff(self, attempt, retry_after=None):
+        """Seconds to wait before retry number attempt+1: full jitter over base * 2**attempt, or Retry-After if longer."""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        if retry_after:
+            try:
+                delay = max(delay, float(retry_after))
+            except ValueError:
+                pass  # HTTP-date form: keep the computed delay
+        return min(delay, self.max_delay)
+
+class CircuitBreaker:
+    """
+    Thread-safe breaker for one host. Closed: requests flow. After `threshold`
+    consecutive failures it opens for `cooldown` seconds; then one probe request
+    is let through (half-open). A success closes it, a failure reopens it with
+    the cooldown doubled up to `max_cooldown`. While half-open only the probe's
+    outcome counts: it gets a token from wait_time()/wait() to pass back to
+    record_success(), record_failure() or release_probe(). With max_trips, the
+    breaker goes down after that many trips without a success in between, and
+    wait_time()/wait() raise HostDown from then on. on_change(state, cooldown)
+    is called on every transition.
+    """
+    CLOSED, OPEN, HALF_OPEN, DOWN = "closed", "open", "half-open", "down"
+    PROBE_POLL_SECS = 0.5
+
+    def __init__(self, threshold=5, cooldown=30.0, max_cooldown=300.0, on_change=None, max_trips=None):
+        self.threshold = threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.max_trips = max_trips
+        self.on_change = on_change
+        self.state = self.CLOSED
+        self.failures = 0
+        self.cooldown = cooldown
+        self.trips = 0
+        self._trip_streak = 0  # trips since the last success
+        self._opened_at = 0.0
+        self._probe = None  # token of the request let through as the half-open probe
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    def _set(self, state):
+        self.state = state
+        if self.on_change is not None:
+            self.on_change(state, self.cooldown)
+
+    def wait_time(self):
+        """
+        (secs, probe): secs is 0 if a request may go now, else how long to wait
+        before asking again; probe is the request's token if it goes as the
+        half-open probe, else None.
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return 0.0, None
+            if self.state == self.DOWN:
+                raise HostDown(f"gave up after {self._trip_streak} pauses without an answer")
+            if self.state == self.HALF_OPEN:
+                return self.PROBE_POLL_SECS, None  # a probe is in flight
+            remaining = self._opened_at + self.cooldown - time.monotonic()
+            if remaining > 0:
+                return remaining, None
+            self._probes += 1
+            self._probe = self._probes
+            self._set(self.HALF_OPEN)
+            return 0.0, self._probe
+
+    def wait(self, cancel=None):
+        """Block until a request may go. Returns (True, probe) as wait_time() does, or (False, None) if `cancel` fires first."""
+        while True:
+            wait, probe = self.wait_time()
+            if wait <= 0:
+                return True, probe
+            if cancel is None:
+                time.sleep(min(wait, 1.0))
+            elif cancel.wait(min(wait, 1.0)):
+                return False, None
+
+    def _ignored(self, probe):
+        # While half-open, a request that went out before the breaker opened doesn't speak for the host.
+        return self.state == self.HALF_OPEN and (probe is None or probe != self._probe)
+
+    def record_success(self, probe=None):
+        with self._lock:
+            if self._ignored(probe):
+                return
+            self.failures = 0
+            self._probe = None
+            self._trip_streak = 0
+            if self.state != self.CLOSED:
+                self.cooldown = self.base_cooldown
+                self._set(self.CLOSED)
+
+    def record_failure(self, probe=None):
+        with self._lock:
+            if self._ignored(probe):
+                return
+            self.failures += 1
+            if self.state == self.HALF_OPEN:
+                self._probe = None
+                self.cooldown = min(self.max_cooldown, self.cooldown * 2)
+            elif self.state in (self.OPEN, self.DOWN) or self.failures < self.threshold:
+                return
+            self._opened_at = time.monotonic()
+            self.trips += 1
+            self._trip_streak += 1
+            self._set(self.DOWN if self.max_trips and self._trip_streak >= self.max_trips else self.OPEN)
+
+    def release_probe(self, probe):
+        """Drop a half-open probe that ended without a verdict (canceled, or a non-retryable error); the next request probes."""
+        with self._lock:
+            if probe is not None and self.state == self.HALF_OPEN and probe == self._probe:
+                self._probe = None
+                self._opened_at = time.monotonic() - self.cooldown
+                self.state = self.OPEN  # quietly: the cooldown is already over
@@ -12,17 +12,18 @@ from tkinter import ttk
 import sys
 import os
 import webbrowser
-import datetime
-import urllib
 import threading
 import queue
 
-import requests
-from bs4 import BeautifulSoup
-import csv
 import winsound
 from tkcalendar import DateEntry  # date dropdown
 
+from pipeline import (CONFIG_DIR, LOG_QUEUE, EVENT_QUEUE, CANCEL_EVENT, CASE_DB_NAME, LOG_DEBUG, LOG_INFO,
+                      ui_log, ui_event, set_log_level, aiohttp, batch_dates, run_scrape)
+import columnar
+from progress import format_progress
+from counties import resolve_counties
+
 # ---------- App metadata ----------
 APP_NAME = "Nebraska Courts E-Services Scraper V2"
 APP_VER  = "2.0"
@@ -32,6 +33,11 @@ DOCS_URL = "https://www.omahait.com/ai-automation"  # adjust if needed
 ALEX_NAME = "Alexander Clark of Metatheria, LLC"
 ALEX_URL  = "https://clarkmanagementconsulting.com"
 
+# ---------- Status log ----------
+LOG_POLL_MS      = 100   # how often queued log lines are drawn
+LOG_MAX_PER_TICK = 2000  # lines drawn per tick; the rest wait for the next one
+LOG_MAX_LINES    = 5000  # lines kept in the status pane (oldest trimmed first)
+
 # ---------- Windows DPAPI encryption for saved creds ----------
 import base64
 import configparser
@@ -39,7 +45,6 @@ import ctypes
 from ctypes import Structure, POINTER, byref, c_byte, create_string_buffer, cast, windll, string_at
 from ctypes.wintypes import DWORD
 
-CONFIG_DIR  = os.path.join(os.getenv("APPDATA") or os.path.expanduser("~"), "NEJusticeScraper")
 CONFIG_PATH = os.path.join(CONFIG_DIR, "settings.ini")
 
 def ensure_config_dir():
@@ -166,308 +171,37 @@ def load_azure_theme(root):
             style.theme_use("clam")
     return style
 
-# ---------- Logging queues ----------
-LOG_QUEUE = queue.Queue()
-EVENT_QUEUE = queue.Queue()
-CANCEL_EVENT = threading.Event()
-WORKER = None
-
-def ui_log(msg: str): LOG_QUEUE.put(msg)
-def ui_event(kind, payload=None): EVENT_QUEUE.put((kind, payload))
-
-# ---------- Scraping logic ----------
-def validate(date_text):
-    try:
-        datetime.datetime.strptime(date_text, '%m/%d/%Y')
-    except ValueError:
-        raise ValueError("Incorrect Date format, should be mm/dd/yyyy")
+# ---------- GUI worker ----------
+GUI_COUNTY_SETS = {"1": "metro", "3": "top10", "2": "all"}  # c_option radio value -> COUNTY_SETS key
 
-def desktop_folder():
-    return os.path.join(os.path.expanduser("~"), "Desktop")
-
-county_numbers_dict = {"Adams" : "14",
- "Antelope" : "26", "Arthur" : "91", "Banner" : "85", "Blaine" : "86", "Boone" : "23",
- "Box Butte" : "65", "Boyd" : "63", "Brown" : "75", "Buffalo" : "09", "Burt" : "31",
- "Butler" : "25", "Cass" : "20", "Cedar" : "13", "Chase" : "72", "Cherry" : "66",
- "Cheyenne" : "39", "Clay" : "30", "Colfax" : "43", "Cuming" : "24", "Custer" : "04",
- "Dakota" : "70", "Dawes" : "69", "Dawson" : "18", "Deuel" : "78", "Dixon" : "35",
- "Dodge" : "05", "Douglas" : "01", "Dundy" : "76", "Fillmore" : "34", "Franklin" : "50",
- "Frontier" : "60", "Furnas" : "38", "Gage" : "03", "Garden" : "77", "Garfield" : "83",
- "Gosper" : "73", "Grant" : "92", "Greeley" : "62", "Hall" : "08", "Hamilton" : "28",
- "Harlan" : "51", "Hayes" : "79", "Hitchcock" : "67", "Holt" : "36", "Hooker" : "93",
- "Howard" : "49", "Jefferson" : "33", "Johnson" : "57", "Kearney" : "52", "Keith" : "68",
- "Keya Paha" : "82", "Kimball" : "71", "Knox" : "12", "Lancaster" : "02", "Lincoln" : "15",
- "Logan" : "87", "Loup" : "88", "Madison" : "07", "McPherson" : "90", "Merrick" : "46",
- "Morrill" : "64", "Nance" : "58", "Nemaha" : "44", "Nuckolls" : "42", "Otoe" : "11",
- "Pawnee" : "54", "Perkins" : "74", "Phelps" : "37", "Pierce" : "40", "Platte" : "10",
- "Polk" : "41", "Red Willow" : "48", "Richardson" : "19", "Rock" : "81", "Saline" : "22",
- "Sarpy" : "59", "Saunders" : "06", "Scotts Bluff" : "21", "Seward" : "16", "Sheridan" : "61",
- "Sherman" : "56", "Sioux" : "80", "Stanton" : "53", "Thayer" : "32", "Thomas" : "89",
- "Thurston" : "55", "Valley" : "47", "Washington" : "29", "Wayne" : "27", "Webster" : "45",
- "Wheeler" : "84", "York" : "17"}
-
-# ---- NEW: helpers to write a partial CSV on cancel ----
-def _parse_case_and_county_from_url(url: str):
-    """Robustly build (case_number, county_name) from case URL query params."""
-    try:
-        parsed = urllib.parse.urlparse(url)
-        qs = urllib.parse.parse_qs(parsed.query)
-        cy = (qs.get("case_year") or [""])[0]
-        cid = (qs.get("case_id") or [""])[0]
-        cnum = (qs.get("county_num") or [""])[0]
-        case_no = f"{cy}CI{cid}" if cy and cid else ""
-        county = ""
-        if cnum:
-            for k, v in county_numbers_dict.items():
-                if v == cnum:
-                    county = k
-                    break
-        return case_no, county
-    except Exception:
-        return "", ""
-
-def write_partial_csv(addresses, restitution_cases, targetDate, out_dir):
-    """Write whatever we have to a _partial CSV."""
-    try:
-        os.makedirs(out_dir, exist_ok=True)
-    except Exception:
-        pass
-
-    headers = ['name', 'address', 'city state zip', 'case number', 'county']
-    rows = []
-
-    # Prefer addresses we've started enriching
-    if addresses:
-        for addr in addresses:
-            url = addr[0] if addr else ""
-            case_no, county = _parse_case_and_county_from_url(url) if url else ("", "")
-            name = addr[1] if len(addr) > 1 else ""
-            addr1 = addr[2] if len(addr) > 2 else ""
-            city_state_zip = addr[3] if len(addr) > 3 else ""
-            rows.append([name, addr1, city_state_zip, case_no, county])
-
-    # If we had not reached docket fetch yet, fall back to restitution_cases
-    if not rows and restitution_cases:
-        for rc in restitution_cases:
-            if len(rc) >= 9:
-                url = rc[8]
-                case_no, county_from_url = _parse_case_and_county_from_url(url)
-                county = rc[7] if len(rc) >= 8 else county_from_url
-                rows.append(["", "", "", case_no, county])
-
-    # If truly nothing, just write headers
-    data = [headers] + rows
-    filename = (
-        "eviction_cases_for_"
-        + datetime.datetime.strptime(targetDate, '%m/%d/%Y').strftime('%Y-%m-%d')
-        + "_partial_generated_on_"
-        + datetime.datetime.now().strftime('%Y-%m-%d-%H-%M')
-        + ".csv"
-    )
-    out_path = os.path.join(out_dir or desktop_folder(), filename)
-    with open(out_path, "w", newline="", encoding="utf-8") as f:
-        csv.writer(f, quoting=csv.QUOTE_ALL).writerows(data)
-    return out_path
-# -------------------------------------------------------
-
-def scrapeCalendar():
+def scrapeCalendar(resume=False):
     """
-    Runs in a background thread. Uses CANCEL_EVENT for graceful stop.
+    Runs in a background thread: snapshots the form, runs the pipeline with the
+    selected engine, and reports failures to the UI. Uses CANCEL_EVENT for graceful stop.
     """
     try:
         # Persist settings each run
         save_settings(remember_var.get(), user_entry.get(), pass_entry.get(), save_dir_var.get())
 
-        # County list
-        if (c_option.get() == "2"):
-            counties_list = ["Adams", "Antelope", "Arthur", "Banner", "Blaine", "Boone", "Box Butte", "Boyd", "Brown", "Buffalo", "Burt", "Butler", "Cass", "Cedar", "Chase", "Cherry", "Cheyenne", "Clay", "Colfax", "Cuming", "Custer", "Dakota", "Dawes", "Dawson", "Deuel", "Dixon", "Dodge", "Douglas", "Dundy", "Fillmore", "Franklin", "Frontier", "Furnas", "Gage", "Garden", "Garfield", "Gosper", "Grant", "Greeley", "Hall", "Hamilton", "Harlan", "Hayes", "Hitchcock", "Holt", "Hooker", "Howard", "Jefferson", "Johnson", "Kearney", "Keith", "Keya Paha", "Kimball", "Knox", "Lancaster", "Lincoln", "Logan", "Loup", "Madison", "McPherson", "Merrick", "Morrill", "Nance", "Nemaha", "Nuckolls", "Otoe", "Pawnee", "Perkins", "Phelps", "Pierce", "Platte", "Polk", "Red Willow", "Richardson", "Rock", "Saline", "Sarpy", "Saunders", "Scotts Bluff", "Seward", "Sheridan", "Sherman", "Sioux", "Stanton", "Thayer", "Thomas", "Thurston", "Valley", "Washington", "Wayne", "Webster", "Wheeler", "York"]
-        if (c_option.get() == "1"):
-            counties_list = ["Douglas", "Lancaster", "Sarpy"]
-        if (c_option.get() == "3"):
-            counties_list = ["Douglas", "Lancaster", "Sarpy", "Hall", "Buffalo", "Dodge", "Scotts Bluff", "Madison", "Platte", "Lincoln"]
-
-        ui_event("phase", "Processing…")
-        ui_log("Processing...")
-        targetDate = entry1.get()
-        username = user_entry.get()
-        password = pass_entry.get()
-        validate(targetDate)
-
-        restitution_cases = []
-        addresses = []
-
-        # calendar scrape
-        for county in counties_list:
-            if CANCEL_EVENT.is_set():
-                ui_event("phase", "Stopping… writing partial CSV…")
-                out_path = write_partial_csv(addresses, restitution_cases, targetDate, save_dir_var.get().strip() or desktop_folder())
-                ui_event("done", out_path)
-                return
-            ui_log(f"Getting case numbers for eviction cases (Restitution, Real Fed, FED or LLT is in description) for {targetDate} from the calendar for {county} county...")
-            params = {
-              ('court', 'C'),
-              ('countyC', county),
-              ('countyD', ''),
-              ('selectRadio', 'date'),
-              ('searchField', targetDate),
-              ('submitButton', 'Submit'),
-            }
-            try:
-                response = requests.get('https://www.nebraska.gov/courts/calendar/index.cgi', params=params, timeout=45)
-            except Exception as e:
-                ui_log(f"[WARN] Calendar failed for {county}: {e}")
-                continue
-            if CANCEL_EVENT.is_set():
-                ui_event("phase", "Stopping… writing partial CSV…")
-                out_path = write_partial_csv(addresses, restitution_cases, targetDate, save_dir_var.get().strip() or desktop_folder())
-                ui_event("done", out_path)
-                return
-            soup = BeautifulSoup(response.content, 'lxml')
-            rows = soup.find_all('tr')
-            for row in rows:
-                if CANCEL_EVENT.is_set():
-                    ui_event("phase", "Stopping… writing partial CSV…")
-                    out_path = write_partial_csv(addresses, restitution_cases, targetDate, save_dir_var.get().strip() or desktop_folder())
-                    ui_event("done", out_path)
-                    return
-                if "Restitution" in row.get_text() or "Real Fed" in row.get_text() or "LLT" in row.get_text() or "FED" in row.get_text():
-                    listrow = row.get_text().splitlines()
-                    if ("CR" not in listrow[6]):
-                        listrow.append(county)
-                        ui_log(f"Adding {listrow[7]} county case number {listrow[6]} to the list to scrape.")
-                        case_url = 'https://www.nebraska.gov/justice/case.cgi?search=1&from_case_search=1&court_type=C&county_num='
-                        case_url += county_numbers_dict.get(listrow[7])
-                        case_url += '&case_type=CI&case_year='
-                        case_url += listrow[6][2:4]
-                        case_url += '&case_id='
-                        case_url += listrow[6][4:]
-                        case_url += '&client_data=&search=Search+Now'
-                        listrow.append(case_url)
-                        restitution_cases.append(listrow)
-
-        if CANCEL_EVENT.is_set():
-            ui_event("phase", "Stopping… writing partial CSV…")
-            out_path = write_partial_csv(addresses, restitution_cases, targetDate, save_dir_var.get().strip() or desktop_folder())
-            ui_event("done", out_path)
-            return
-
-        ui_event("phase", "Deduplicating list…")
-        for restitution_case in restitution_cases:
-            address = [restitution_case[8]]
-            if address not in addresses:
-                addresses.append(address)
-
-        # dockets
-        ui_event("phase", "Retrieving dockets…")
-        for address in addresses:
-            if CANCEL_EVENT.is_set():
-                ui_event("phase", "Stopping… writing partial CSV…")
-                out_path = write_partial_csv(addresses, restitution_cases, targetDate, save_dir_var.get().strip() or desktop_folder())
-                ui_event("done", out_path)
-                return
-            ui_log("Retrieving " + address[0])
-            try:
-                docket_response = requests.get(address[0], auth=(username, password), timeout=60)
-            except Exception as e:
-                ui_log(f"[WARN] Docket failed {address[0]}: {e}")
-                address.extend(['could not retrieve'] * 4)
-                continue
-            docket_soup = BeautifulSoup(docket_response.content, 'lxml')
-            docket_blocks = docket_soup.find_all('pre')
-            num_pre_blocks = len(docket_blocks)
-            if num_pre_blocks < 2:
-                ui_log("Could not find docket party and address info in case at " + address[0])
-                address.extend(['could not retrieve'] * 4)
-            else:
-                ui_log("Docket Party and Address Info" + docket_blocks[1].get_text())
-                attorney_column_offset = docket_blocks[1].get_text().find("Attorney")
-                ui_log("Client Info Ends at Text Column #" + str(attorney_column_offset))
-                addresslines = docket_blocks[1].get_text().splitlines()
-                addresslines_no_attys = list()
-                if attorney_column_offset > 0:
-                    for addressline in addresslines:
-                        addresslines_no_attys.append(addressline[0:attorney_column_offset])
-                addresslines = [line.strip() for line in addresslines_no_attys]
-                ui_log("Extracted Client Info:")
-                ui_log(str(addresslines))
-                start_yet = 0
-                defendant_count = 0
-                current_line = -1
-                for addressline in addresslines:
-                    if CANCEL_EVENT.is_set():
-                        ui_event("phase", "Stopping… writing partial CSV…")
-                        out_path = write_partial_csv(addresses, restitution_cases, targetDate, save_dir_var.get().strip() or desktop_folder())
-                        ui_event("done", out_path)
-                        return
-                    current_line += 1
-                    if "Limited Representation Attorney" in addressline or " owes " in addressline or "Alias is " in addressline:
-                        start_yet = 0
-                    if "Defendant" in addressline:
-                        start_yet = 1
-                        defendant_count += 1
-                    if start_yet == 1 and defendant_count == 1:
-                        address.append(addressline)
-                    if start_yet == 1 and defendant_count > 1:
-                        if "Defendant" in addressline:
-                            nxt = addresslines[current_line + 1] if current_line + 1 < len(addresslines) else ""
-                            if ("ccupants" not in nxt and "CCUPANTS" not in nxt and
-                                "ll other" not in nxt and "LL OTHER" not in nxt and
-                                "ll Other" not in nxt and "John Doe" not in nxt and
-                                "Jane Doe" not in nxt and "Real Name Unknown" not in nxt):
-                                address[2] = address[2] + ", " + nxt
-
-        if CANCEL_EVENT.is_set():
-            ui_event("phase", "Stopping… writing partial CSV…")
-            out_path = write_partial_csv(addresses, restitution_cases, targetDate, save_dir_var.get().strip() or desktop_folder())
-            ui_event("done", out_path)
-            return
-
-        # tidy and write CSV (final full write)
-        ui_event("phase", "Tidying rows…")
-        for address in addresses:
-            if (len(address) == 2):
-                address.insert(1, " "); address.insert(2, " "); address.insert(3, " "); address.insert(4, " ")
-            if (len(address) == 3):
-                address.insert(2, " "); address.insert(3, " "); address.insert(4, " ")
-            if (len(address) == 4):
-                address.insert(3, " "); address.insert(4, " ")
-            if (len(address) == 5):
-                address.insert(4, " ")
-            address[5] = " ".join(address[5].split())
-            address.append(address[0][120:122] + "CI" + address[0][131:138])
-            address.append(list(county_numbers_dict.keys())[list(county_numbers_dict.values()).index(address[0][94:96])])
-            address.pop(1)
-            address[2] = address[2] + " " + address[3]
-            address.pop(3)
-            address[2].rstrip(" ,")
-        for address in addresses:
-            address.pop(0)
-            if len(address) == 6 and address[3] == "":
-                address.pop(3)
-
-        headers = ['name', 'address', 'city state zip', 'case number', 'county']
-        addresses.insert(0, headers)
-        filename = "eviction_cases_for_" + datetime.datetime.strptime(targetDate, '%m/%d/%Y').strftime('%Y-%m-%d') + "_generated_on_" + datetime.datetime.now().strftime('%Y-%m-%d-%H-%M') + ".csv"
-
+        counties_list = resolve_counties(GUI_COUNTY_SETS.get(c_option.get(), "metro"))
+        targetDates = batch_dates(entry1.get(), entry2.get() if range_var.get() else None)
         out_dir = save_dir_var.get().strip() or desktop_folder()
-        try:
-            os.makedirs(out_dir, exist_ok=True)
-        except Exception:
-            pass
-        out_path = os.path.join(out_dir, filename)
-
-        ui_event("phase", "Writing CSV…")
-        with open(out_path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f, quoting=csv.QUOTE_ALL)
-            writer.writerows(addresses)
-
-        try:
-            winsound.Beep(2500, 250)
-        except Exception:
-            pass
-
-        ui_log("Done.")
-        ui_event("done", out_path)
+        set_log_level(LOG_DEBUG if debug_log_var.get() else LOG_INFO)
+
+        run_scrape(counties_list, targetDates, user_entry.get(), pass_entry.get(), out_dir,
+                   engine=engine_var.get(), resume=resume,
+                   use_cache=use_cache_var.get(), per_date=per_date_var.get(),
+                   incremental=incremental_var.get(),
+                   db_path=os.path.join(out_dir, CASE_DB_NAME) if use_db_var.get() else None,
+                   parquet=parquet_var.get(),
+                   archive_dir="" if archive_var.get() else None,
+                   parse_workers=0)  # worker processes would re-run this script (and open a window) on Windows
+
+        if not CANCEL_EVENT.is_set():
+            try:
+                winsound.Beep(2500, 250)
+            except Exception:
+                pass
 
     except Exception as e:
         ui_log(f"[ERROR] {e}")
@@ -551,6 +285,12 @@ status_frame = ttk.LabelFrame(root, text="Status", padding=6)
 label1 = ttk.Label(date_frame, text="Please select a date:")
 entry1 = DateEntry(date_frame, width=12, background='darkblue',
                    foreground='white', borderwidth=2, date_pattern='mm/dd/yyyy')
+range_var = tk.BooleanVar(value=False)
+range_chk = ttk.Checkbutton(date_frame, text="Through:", variable=range_var)
+entry2 = DateEntry(date_frame, width=12, background='darkblue',
+                   foreground='white', borderwidth=2, date_pattern='mm/dd/yyyy')
+per_date_var = tk.BooleanVar(value=False)
+per_date_chk = ttk.Checkbutton(date_frame, text="One CSV per date", variable=per_date_var)
 
 # County radios
 c_option = tk.StringVar(None, "1")
@@ -558,6 +298,30 @@ option1 = ttk.Radiobutton(options_frame, text="Douglas, Lancaster and Sarpy Only
 option3 = ttk.Radiobutton(options_frame, text="Top 10 Counties", variable=c_option, value="3")
 option2 = ttk.Radiobutton(options_frame, text="All Nebraska Counties", variable=c_option, value="2")
 
+# Engine radios
+engine_var = tk.StringVar(None, "threads")
+engine_sep = ttk.Separator(options_frame, orient="horizontal")
+engine_threads = ttk.Radiobutton(options_frame, text="Engine: threads", variable=engine_var, value="threads")
+engine_async = ttk.Radiobutton(options_frame, text="Engine: asyncio" + ("" if aiohttp else " (needs aiohttp)"),
+                               variable=engine_var, value="asyncio")
+if aiohttp is None:
+    engine_async.config(state="disabled")
+use_cache_var = tk.BooleanVar(value=True)
+use_cache_chk = ttk.Checkbutton(options_frame, text="Reuse cached dockets", variable=use_cache_var)
+incremental_var = tk.BooleanVar(value=False)
+incremental_chk = ttk.Checkbutton(options_frame, text="Only new and changed cases", variable=incremental_var)
+use_db_var = tk.BooleanVar(value=False)
+use_db_chk = ttk.Checkbutton(options_frame, text="Also save to case database", variable=use_db_var)
+parquet_var = tk.BooleanVar(value=False)
+parquet_chk = ttk.Checkbutton(options_frame, text="Also write Parquet" + ("" if columnar.available() else " (needs pyarrow)"),
+                              variable=parquet_var)
+if not columnar.available():
+    parquet_chk.config(state="disabled")
+archive_var = tk.BooleanVar(value=False)
+archive_chk = ttk.Checkbutton(options_frame, text="Keep raw pages for re-parsing", variable=archive_var)
+debug_log_var = tk.BooleanVar(value=False)
+debug_log_chk = ttk.Checkbutton(options_frame, text="Debug log (raw docket text)", variable=debug_log_var)
+
 # Credentials + remember me
 user_entry_label = ttk.Label(cred_frame, text="Username")
 user_entry = ttk.Entry(cred_frame)
@@ -595,6 +359,7 @@ progress = ttk.Progressbar(status_frame, orient="horizontal", mode="indeterminat
 log_widget = ScrolledText(status_frame, height=12, width=100, state="disabled", wrap="word")
 
 btn_start = ttk.Button(root, text="Start", width=12)
+btn_resume = ttk.Button(root, text="Resume", width=12)
 btn_stop  = ttk.Button(root, text="Stop",  width=12, state="disabled")
 def open_folder():
     path = save_dir_var.get().strip() or desktop_folder()
@@ -612,11 +377,23 @@ link_label.bind("<Button-1>", lambda e: webbrowser.open(ORG_URL))
 date_frame.grid(row=0, column=0, padx=10, pady=10, sticky="nw")
 label1.grid(row=0, column=0, sticky="w")
 entry1.grid(row=1, column=0, sticky="w")
+range_chk.grid(row=2, column=0, sticky="w", pady=(6,0))
+entry2.grid(row=3, column=0, sticky="w")
+per_date_chk.grid(row=4, column=0, sticky="w", pady=(6,0))
 
 options_frame.grid(row=0, column=1, padx=10, pady=10, sticky="nw")
 option1.grid(row=0, column=0, sticky="w")
 option3.grid(row=1, column=0, sticky="w")
 option2.grid(row=2, column=0, sticky="w")
+engine_sep.grid(row=3, column=0, sticky="we", pady=4)
+engine_threads.grid(row=4, column=0, sticky="w")
+engine_async.grid(row=5, column=0, sticky="w")
+use_cache_chk.grid(row=6, column=0, sticky="w", pady=(4,0))
+incremental_chk.grid(row=7, column=0, sticky="w")
+use_db_chk.grid(row=8, column=0, sticky="w")
+parquet_chk.grid(row=9, column=0, sticky="w")
+archive_chk.grid(row=10, column=0, sticky="w")
+debug_log_chk.grid(row=11, column=0, sticky="w")
 
 cred_frame.grid(row=0, column=2, padx=10, pady=10, sticky="nw")
 user_entry_label.grid(row=0, column=0, sticky="w")
@@ -632,6 +409,7 @@ browse_btn.grid(row=0, column=1, padx=(6,0))
 save_frame.grid_columnconfigure(0, weight=1)
 
 btn_start.grid(row=2, column=0, sticky="w", padx=10, pady=(0,10))
+btn_resume.grid(row=2, column=0, sticky="e", padx=10, pady=(0,10))
 btn_stop.grid(row=2, column=1, sticky="w", padx=10, pady=(0,10))
 btn_open.grid(row=2, column=2, sticky="e", padx=10, pady=(0,10))
 
@@ -657,21 +435,32 @@ WORKER = None
 def set_inputs_enabled(enabled: bool):
     statez = "normal" if enabled else "disabled"
     entry1.config(state=statez)
-    for rb in (option1, option2, option3):
+    entry2.config(state=statez)
+    range_chk.config(state=statez)
+    per_date_chk.config(state=statez)
+    for rb in (option1, option2, option3, engine_threads):
         rb.config(state=statez)
+    engine_async.config(state=statez if aiohttp else "disabled")
     user_entry.config(state=statez)
     pass_entry.config(state=statez)
     save_dir_entry.config(state=statez)
     browse_btn.config(state=statez)
     remember_chk.config(state=statez)
+    use_cache_chk.config(state=statez)
+    incremental_chk.config(state=statez)
+    use_db_chk.config(state=statez)
+    parquet_chk.config(state=statez if columnar.available() else "disabled")
+    archive_chk.config(state=statez)
+    debug_log_chk.config(state=statez)
 
 def set_run_state(running: bool):
     set_inputs_enabled(not running)
     btn_start.config(state="disabled" if running else "normal")
+    btn_resume.config(state="disabled" if running else "normal")
     btn_stop.config(state="normal" if running else "disabled")
     if running:
         status_label.config(text="Starting…")
-        progress.config(mode="indeterminate")
+        progress.config(mode="indeterminate", value=0)
         if not progress_running.get():
             progress.start(50)
             progress_running.set(True)
@@ -681,25 +470,46 @@ def set_run_state(running: bool):
             progress_running.set(False)
         status_label.config(text="Idle.")
 
-def poll_queues():
-    # logs
+def show_progress(snapshot):
+    """Switch the bar to determinate once real counts arrive, and put the counts and ETA in the status label."""
+    if progress_running.get():
+        progress.stop()
+        progress_running.set(False)
+    progress.config(mode="determinate", maximum=max(1, snapshot["total"]), value=snapshot["done"])
+    status_label.config(text=format_progress(snapshot))
+
+def drain_log():
+    """Draw the queued log lines with one insert, keeping at most LOG_MAX_LINES in the pane."""
+    lines = []
     try:
-        while True:
-            msg = LOG_QUEUE.get_nowait()
-            log_widget.config(state="normal")
-            log_widget.insert("end", msg + "\n")
-            log_widget.see("end")
-            log_widget.config(state="disabled")
+        while len(lines) < LOG_MAX_PER_TICK:
+            lines.append(LOG_QUEUE.get_nowait())
     except queue.Empty:
         pass
+    if not lines:
+        return
+    if len(lines) > LOG_MAX_LINES:
+        lines = lines[-LOG_MAX_LINES:]
+    log_widget.config(state="normal")
+    log_widget.insert("end", "\n".join(lines) + "\n")
+    excess = int(log_widget.index("end-1c").split(".")[0]) - 1 - LOG_MAX_LINES
+    if excess > 0:
+        log_widget.delete("1.0", f"{excess + 1}.0")
+    log_widget.see("end")
+    log_widget.config(state="disabled")
+
+def poll_queues():
+    drain_log()
     # events
     try:
         while True:
             kind, payload = EVENT_QUEUE.get_nowait()
             if kind == "phase":
                 status_label.config(text=str(payload))
+            elif kind == "progress":
+                show_progress(payload)
             elif kind == "done":
-                status_label.config(text=f"Done. Saved file: {payload}")
+                status_label.config(text=f"Done. Saved file: {', '.join(payload)}")
                 set_run_state(False)
             elif kind == "error":
                 status_label.config(text=f"Error: {payload}")
@@ -711,16 +521,16 @@ def poll_queues():
                 set_run_state(False)
     except queue.Empty:
         pass
-    root.after(100, poll_queues)
+    root.after(LOG_POLL_MS, poll_queues)
 
-def start_scrape():
+def start_scrape(resume=False):
     # clear log
     log_widget.config(state="normal"); log_widget.delete("1.0", "end"); log_widget.config(state="disabled")
     CANCEL_EVENT.clear()
     set_run_state(True)
     # launch worker
     global WORKER
-    WORKER = threading.Thread(target=scrapeCalendar, daemon=True)
+    WORKER = threading.Thread(target=scrapeCalendar, args=(resume,), daemon=True)
     WORKER.start()
 
 def stop_scrape():
@@ -731,9 +541,10 @@ def stop_scrape():
         btn_stop.config(state="disabled")
 
 btn_start.config(command=start_scrape)
+btn_resume.config(command=lambda: start_scrape(resume=True))
 btn_stop.config(command=stop_scrape)
 
-root.after(100, poll_queues)
+root.after(LOG_POLL_MS, poll_queues)
 
 def on_close():
     save_settings(remember_var.get(), user_entry.get(), pass_entry.get(), save_dir_var.get())